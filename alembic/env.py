@@ -19,6 +19,8 @@ from app.models.lesson import Lesson  # noqa
 from app.models.enrollment import Enrollment  # noqa
 from app.models.lesson_completion import LessonCompletion  # noqa
 from app.models.review import Review  # noqa
+from app.models.user_session import UserSession  # noqa
+from app.models.token_revocation import TokenRevocation  # noqa
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,47 @@
+"""add denormalized enrollment_count to course
+
+Revision ID: 20261016_add_course_enrollment_count
+Revises: 20261016_add_course_keyset_indexes
+Create Date: 2026-10-16 00:50:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_course_enrollment_count'
+down_revision = '20261016_add_course_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_course_published_popularity'
+
+# Backfill from the enrollment table, touching only courses that differ
+BACKFILL = (
+    "UPDATE course SET enrollment_count = "
+    "(SELECT COUNT(*) FROM enrollment WHERE enrollment.course_id = course.id) "
+    "WHERE enrollment_count <> "
+    "(SELECT COUNT(*) FROM enrollment WHERE enrollment.course_id = course.id)"
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'course' not in inspector.get_table_names():
+        return
+    columns = {col['name'] for col in inspector.get_columns('course')}
+    if 'enrollment_count' not in columns:
+        op.add_column('course', sa.Column('enrollment_count', sa.Integer(), nullable=False, server_default='0'))
+    if 'enrollment' in inspector.get_table_names():
+        op.execute(BACKFILL)
+    if INDEX not in {ix['name'] for ix in inspector.get_indexes('course')}:
+        op.create_index(INDEX, 'course', ['is_published', 'enrollment_count', 'id'])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'course' not in inspector.get_table_names():
+        return
+    if INDEX in {ix['name'] for ix in inspector.get_indexes('course')}:
+        op.drop_index(INDEX, table_name='course')
+    if 'enrollment_count' in {col['name'] for col in inspector.get_columns('course')}:
+        op.drop_column('course', 'enrollment_count')
@@ -0,0 +1,38 @@
+"""add composite indexes for keyset pagination of the course catalog
+
+Revision ID: 20261016_add_course_keyset_indexes
+Revises: 20261016_add_course_search_index
+Create Date: 2026-10-16 00:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_course_keyset_indexes'
+down_revision = '20261016_add_course_search_index'
+branch_labels = None
+depends_on = None
+
+# (table, index name, columns)
+INDEXES = [
+    ('course', 'ix_course_published_created', ['is_published', 'created_at', 'id']),
+    ('course', 'ix_course_published_rating', ['is_published', 'average_rating', 'id']),
+    # Per-course enrollment counts for order_by=popularity
+    ('enrollment', 'ix_enrollment_course_id', ['course_id']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table, name, columns in INDEXES:
+        if table in tables and name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table, name, columns in reversed(INDEXES):
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
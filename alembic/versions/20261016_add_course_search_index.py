@@ -0,0 +1,65 @@
+"""add full-text search index on course title, subtitle and description
+
+Revision ID: 20261016_add_course_search_index
+Revises: 20261016_recompute_course_ratings
+Create Date: 2026-10-16 00:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_course_search_index'
+down_revision = '20261016_recompute_course_ratings'
+branch_labels = None
+depends_on = None
+
+# SQLite: external-content FTS5 table kept in sync with course by triggers
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS course_fts USING fts5("
+    "title, subtitle, description, content='course', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS course_fts_ai AFTER INSERT ON course BEGIN "
+    "INSERT INTO course_fts(rowid, title, subtitle, description) "
+    "VALUES (new.id, new.title, new.subtitle, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS course_fts_ad AFTER DELETE ON course BEGIN "
+    "INSERT INTO course_fts(course_fts, rowid, title, subtitle, description) "
+    "VALUES ('delete', old.id, old.title, old.subtitle, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS course_fts_au AFTER UPDATE OF title, subtitle, description ON course BEGIN "
+    "INSERT INTO course_fts(course_fts, rowid, title, subtitle, description) "
+    "VALUES ('delete', old.id, old.title, old.subtitle, old.description); "
+    "INSERT INTO course_fts(rowid, title, subtitle, description) "
+    "VALUES (new.id, new.title, new.subtitle, new.description); END",
+    # Index the rows that existed before the triggers
+    "INSERT INTO course_fts(course_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS course_fts_au",
+    "DROP TRIGGER IF EXISTS course_fts_ad",
+    "DROP TRIGGER IF EXISTS course_fts_ai",
+    "DROP TABLE IF EXISTS course_fts",
+]
+
+# PostgreSQL: GIN index over the weighted tsvector the search query repeats
+POSTGRES_CREATE = [
+    "CREATE INDEX IF NOT EXISTS ix_course_search_tsv ON course USING GIN ("
+    "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(subtitle, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')))",
+]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS ix_course_search_tsv"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if 'course' not in sa.inspect(bind).get_table_names():
+        return
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}.get(bind.dialect.name, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}.get(bind.dialect.name, [])
+    for statement in statements:
+        op.execute(statement)
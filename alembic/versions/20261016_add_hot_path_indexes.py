@@ -0,0 +1,72 @@
+"""add indexes and unique constraints on hot lookup columns
+
+Revision ID: 20261016_add_hot_path_indexes
+Revises: 20261016_add_usersession_table
+Create Date: 2026-10-16 00:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_hot_path_indexes'
+down_revision = '20261016_add_usersession_table'
+branch_labels = None
+depends_on = None
+
+# (table, index name, columns, unique). Unique indexes are used instead of
+# table constraints because SQLite cannot ALTER TABLE ... ADD CONSTRAINT.
+INDEXES = [
+    ('enrollment', 'ix_enrollment_user_course', ['user_id', 'course_id'], True),
+    ('lessoncompletion', 'ix_lessoncompletion_user_lesson', ['user_id', 'lesson_id'], True),
+    ('review', 'ix_review_course_user', ['course_id', 'user_id'], True),
+    ('review', 'ix_review_course_created', ['course_id', 'created_at'], False),
+    ('lesson', 'ix_lesson_course_order', ['course_id', 'order_index'], False),
+    ('quizattempt', 'ix_quizattempt_quiz_user', ['quiz_id', 'user_id'], False),
+    ('question', 'ix_question_quiz_id', ['quiz_id'], False),
+    ('option', 'ix_option_question_id', ['question_id'], False),
+    ('attemptanswer', 'ix_attemptanswer_attempt_id', ['attempt_id'], False),
+]
+
+# Keep the earliest (lowest id) row per key so the unique indexes can be created
+DEDUPLICATE = {
+    'enrollment': "DELETE FROM enrollment WHERE id NOT IN "
+                  "(SELECT MIN(id) FROM enrollment GROUP BY user_id, course_id)",
+    'lessoncompletion': "DELETE FROM lessoncompletion WHERE id NOT IN "
+                        "(SELECT MIN(id) FROM lessoncompletion GROUP BY user_id, lesson_id)",
+    'review': "DELETE FROM review WHERE id NOT IN "
+              "(SELECT MIN(id) FROM review GROUP BY course_id, user_id)",
+}
+
+# Created by scripts/cleanup_db.py on some development databases
+LEGACY_INDEXES = [('lessoncompletion', 'idx_lessoncompletion_user_lesson')]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    # Remove duplicates first, otherwise the unique indexes cannot be created
+    for table, statement in DEDUPLICATE.items():
+        if table in tables:
+            op.execute(statement)
+
+    for table, name in LEGACY_INDEXES:
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+
+    for table, name, columns, unique in INDEXES:
+        if table not in tables:
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+    for table, name, columns, unique in reversed(INDEXES):
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""add token_version column to user
+
+Revision ID: 20261016_add_token_version_to_user
+Revises: 20250909_add_created_at_to_quizattempt
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_token_version_to_user'
+down_revision = '20250909_add_created_at_to_quizattempt'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # token_version is embedded in access tokens; bumping it revokes every token issued before
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    cols = [c['name'] for c in inspector.get_columns('user')]
+    if 'token_version' not in cols:
+        op.add_column('user', sa.Column('token_version', sa.Integer(), nullable=False, server_default=sa.text('0')))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    cols = [c['name'] for c in inspector.get_columns('user')]
+    if 'token_version' in cols:
+        op.drop_column('user', 'token_version')
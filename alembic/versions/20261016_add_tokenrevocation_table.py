@@ -0,0 +1,34 @@
+"""add tokenrevocation log polled by every worker
+
+Revision ID: 20261016_add_tokenrevocation_table
+Revises: 20261016_gap_based_lesson_order
+Create Date: 2026-10-16 01:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_tokenrevocation_table'
+down_revision = '20261016_gap_based_lesson_order'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'tokenrevocation' in inspector.get_table_names():
+        return
+    op.create_table(
+        'tokenrevocation',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'tokenrevocation' in inspector.get_table_names():
+        op.drop_table('tokenrevocation')
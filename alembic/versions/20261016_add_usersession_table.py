@@ -0,0 +1,40 @@
+"""add usersession table for refresh tokens
+
+Revision ID: 20261016_add_usersession_table
+Revises: 20261016_add_token_version_to_user
+Create Date: 2026-10-16 00:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_add_usersession_table'
+down_revision = '20261016_add_token_version_to_user'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'usersession' in inspector.get_table_names():
+        return
+    op.create_table(
+        'usersession',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_usersession_token_hash', 'usersession', ['token_hash'], unique=True)
+    op.create_index('ix_usersession_user_id', 'usersession', ['user_id'])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'usersession' in inspector.get_table_names():
+        op.drop_index('ix_usersession_user_id', table_name='usersession')
+        op.drop_index('ix_usersession_token_hash', table_name='usersession')
+        op.drop_table('usersession')
@@ -0,0 +1,58 @@
+"""space lesson order_index keys GAP apart and track each course's tail key
+
+Revision ID: 20261016_gap_based_lesson_order
+Revises: 20261016_add_course_enrollment_count
+Create Date: 2026-10-16 01:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_gap_based_lesson_order'
+down_revision = '20261016_add_course_enrollment_count'
+branch_labels = None
+depends_on = None
+
+# Spacing between neighbouring keys (app.core.lesson_order.GAP when this was written)
+GAP = 1024
+
+
+def respace_lessons(gap: int) -> str:
+    """Renumber every course's lessons to gap, 2*gap, ... keeping their order (SQLite 3.25+, PostgreSQL)."""
+    return (
+        f"UPDATE lesson SET order_index = ("
+        f"SELECT ranked.position * {gap} FROM ("
+        f"SELECT id, ROW_NUMBER() OVER (PARTITION BY course_id ORDER BY order_index, id) AS position "
+        f"FROM lesson) AS ranked WHERE ranked.id = lesson.id)"
+    )
+
+
+# Point every course's lesson_order_tail at its highest lesson key
+SYNC_LESSON_ORDER_TAIL = (
+    "UPDATE course SET lesson_order_tail = "
+    "COALESCE((SELECT MAX(order_index) FROM lesson WHERE lesson.course_id = course.id), 0)"
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    if 'course' not in tables:
+        return
+    cols = [c['name'] for c in inspector.get_columns('course')]
+    if 'lesson_order_tail' not in cols:
+        op.add_column('course', sa.Column('lesson_order_tail', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    if 'lesson' in tables:
+        # Existing 0, 1, 2, ... (possibly with duplicates) become GAP, 2*GAP, ...
+        op.execute(respace_lessons(GAP))
+        op.execute(SYNC_LESSON_ORDER_TAIL)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    if 'lesson' in tables:
+        # Back to dense 1, 2, 3, ...
+        op.execute(respace_lessons(1))
+    if 'course' in tables and 'lesson_order_tail' in [c['name'] for c in inspector.get_columns('course')]:
+        op.drop_column('course', 'lesson_order_tail')
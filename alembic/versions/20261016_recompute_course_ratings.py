@@ -0,0 +1,34 @@
+"""recompute course average_rating after review deduplication
+
+Data-only migration. 20261016_add_hot_path_indexes deletes duplicate
+(course_id, user_id) reviews before creating its unique index, which can
+leave stale averages behind; this recomputes them from the remaining reviews.
+Databases that ran an earlier version of that migration already did this
+inside it.
+
+Revision ID: 20261016_recompute_course_ratings
+Revises: 20261016_add_hot_path_indexes
+Create Date: 2026-10-16 00:25:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_recompute_course_ratings'
+down_revision = '20261016_add_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'review' in tables and 'course' in tables:
+        op.execute(
+            "UPDATE course SET average_rating = COALESCE("
+            "(SELECT ROUND(AVG(rating), 2) FROM review WHERE review.course_id = course.id), 0)"
+        )
+
+
+def downgrade() -> None:
+    # The previous averages are not recoverable and the recomputed ones stay valid
+    pass
@@ -0,0 +1,162 @@
+"""gzip for JSON and text responses.
+
+CompressionMiddleware compresses eligible responses as they are sent. Bodies
+that live in a cache are compressed once with gzip_body() and served with
+Content-Encoding already set (see app.api.http_cache); the middleware passes
+any response that already has a Content-Encoding through untouched.
+
+Kept free of Starlette and application settings so it can be tested alone.
+"""
+import gzip
+import zlib
+from typing import Optional
+
+# Media types worth compressing besides text/*
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+# Compressing these would buffer or break them
+_NEVER_COMPRESS = {"text/event-stream"}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in _NEVER_COMPRESS:
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (an explicit q=0 refuses it)."""
+    if not accept_encoding:
+        return False
+    wildcard = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return bool(wildcard)
+
+
+def gzip_body(body: bytes, level: int = 6) -> bytes:
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def weak_etag(etag: str) -> str:
+    """The compressed representation gets a weak validator derived from the strong one."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def _get_header(headers: list, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _set_header(headers: list, name: bytes, value: bytes) -> None:
+    headers[:] = [(key, val) for key, val in headers if key.lower() != name]
+    headers.append((name, value))
+
+
+def _add_vary(headers: list) -> None:
+    vary = _get_header(headers, b"vary")
+    if vary is None:
+        headers.append((b"vary", b"Accept-Encoding"))
+    elif b"accept-encoding" not in vary.lower() and b"*" not in vary:
+        _set_header(headers, b"vary", vary + b", Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """ASGI middleware that gzips JSON and text responses.
+
+    A response is compressed when the client accepts gzip, its media type is
+    allowlisted, it has no Content-Encoding yet and (for single-message
+    bodies) it is at least `minimum_size` bytes. Streamed bodies are
+    compressed incrementally.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _get_header(list(scope.get("headers") or []), b"accept-encoding")
+        accepts = accepts_gzip(accept_encoding.decode("latin-1") if accept_encoding else None)
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows how large the body is
+                start_message = message
+                return
+
+            if compressor is not None:
+                chunk = compressor.compress(message.get("body", b""))
+                if not message.get("more_body", False):
+                    chunk += compressor.flush()
+                await send({**message, "body": chunk})
+                return
+
+            headers = list(start_message.get("headers") or [])
+            content_type = _get_header(headers, b"content-type")
+            eligible = (
+                start_message["status"] not in (204, 304)
+                and _get_header(headers, b"content-encoding") is None
+                and is_compressible(content_type.decode("latin-1") if content_type else None)
+            )
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if eligible:
+                _add_vary(headers)
+            if not eligible or not accepts or (not more_body and len(body) < self.minimum_size):
+                passthrough = True
+                await send({**start_message, "headers": headers})
+                await send(message)
+                return
+
+            _set_header(headers, b"content-encoding", b"gzip")
+            etag = _get_header(headers, b"etag")
+            if etag is not None:
+                _set_header(headers, b"etag", weak_etag(etag.decode("latin-1")).encode("latin-1"))
+            if more_body:
+                # Length is unknown until the stream ends
+                headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+                compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                body = compressor.compress(body)
+            else:
+                body = gzip_body(body, self.level)
+                _set_header(headers, b"content-length", str(len(body)).encode("latin-1"))
+            await send({**start_message, "headers": headers})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
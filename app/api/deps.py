@@ -1,59 +1,127 @@
 from typing import Annotated, AsyncGenerator
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.cache import principal_cache
 from app.core.config import settings
 from app.core.security import ALGORITHM
-from app.db.base import get_db
+from app.core.token_versions import token_versions
+from app.api.read_your_writes import LAST_WRITE_HEADER, wrote_recently
+from app.db.base import get_db, async_primary_read_session, async_read_session, read_engine
 from app.models.user import User, UserRole
-from app.schemas.user import TokenPayload
+from app.schemas.user import Principal, TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user_optional(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    token: Annotated[str | None, Depends(oauth2_scheme)] = None,
-) -> User | None:
-    """Return the current user or None if no valid token provided."""
+def _decode_token(token: str | None) -> TokenPayload | None:
     if not token:
         return None
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         token_data = TokenPayload(**payload)
-        if token_data.sub is None:
-            return None
-    except JWTError:
+        int(token_data.sub)
+    except (JWTError, ValidationError, ValueError):
         return None
+    return token_data
+
 
-    result = await db.execute(select(User).where(User.id == int(token_data.sub)))
+async def _principal_from_token(token: str | None) -> Principal | None:
+    """Verify the token signature and its role/version claims without touching the user table.
+
+    Tokens issued before role claims existed carry neither `role` nor `ver`; they are
+    treated as version 0 and take their role from the version table.
+    """
+    token_data = _decode_token(token)
+    if token_data is None:
+        return None
+    user_id = int(token_data.sub)
+
+    entry = await token_versions.lookup(user_id)
+    if entry is None:
+        return None
+    current_version, current_role = entry
+    if (token_data.ver or 0) != current_version:
+        return None
+    if token_data.role is not None and token_data.role != current_role.value:
+        return None
+    return Principal(id=user_id, role=current_role)
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> User | None:
+    """Return the user for `user_id`, serving from the principal cache when possible."""
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+    result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
+    if user is not None:
+        # Detach so the cached instance is never flushed or expired by this
+        # request's session; only column attributes are read from it.
+        db.expunge(user)
+        principal_cache.set(user_id, user)
     return user
 
+
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)]
+) -> Principal:
+    """Return the caller's id and role from the access token; runs no SQL on the hot path."""
+    principal = await _principal_from_token(token)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes, bound to the read replica when one is configured.
+
+    Clients whose X-Last-Write marker (set by ReadYourWritesMiddleware) is less
+    than READ_YOUR_WRITES_SECONDS old are served from the primary instead, so
+    they always see their own changes whichever worker handled the write. Sessions run in
+    autocommit mode: no connection is checked out until the first statement,
+    and no BEGIN/COMMIT is issued. The session is only closed.
+    """
+    session_factory = async_read_session
+    if read_engine is not None:
+        if wrote_recently(request.headers.get(LAST_WRITE_HEADER), settings.READ_YOUR_WRITES_SECONDS):
+            session_factory = async_primary_read_session
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_current_user_optional(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    token: Annotated[str | None, Depends(oauth2_scheme)] = None,
+) -> User | None:
+    """Return the current user or None if no valid token provided."""
+    principal = await _principal_from_token(token)
+    if principal is None:
+        return None
+    return await _load_user(db, principal.id)
+
 async def get_current_user(
     db: Annotated[AsyncSession, Depends(get_db)],
-    token: Annotated[str, Depends(oauth2_scheme)]
+    principal: Annotated[Principal, Depends(get_current_principal)]
 ) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        token_data = TokenPayload(**payload)
-        if token_data.sub is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    result = await db.execute(select(User).where(User.id == int(token_data.sub)))
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, principal.id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 async def get_current_active_user(
@@ -64,20 +132,20 @@ async def get_current_active_user(
     return current_user
 
 def get_current_active_superuser(
-    current_user: Annotated[User, Depends(get_current_active_user)]
-) -> User:
-    if current_user.role != UserRole.ADMIN:
+    principal: Annotated[Principal, Depends(get_current_principal)]
+) -> Principal:
+    if principal.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
+    return principal
 
 def get_current_instructor_or_admin(
-    current_user: Annotated[User, Depends(get_current_active_user)]
-) -> User:
-    if current_user.role not in [UserRole.INSTRUCTOR, UserRole.ADMIN]:
+    principal: Annotated[Principal, Depends(get_current_principal)]
+) -> Principal:
+    if principal.role not in [UserRole.INSTRUCTOR, UserRole.ADMIN]:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have instructor privileges"
         )
-    return current_user
+    return principal
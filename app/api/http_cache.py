@@ -0,0 +1,53 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.api.compression import accepts_gzip, gzip_body, weak_etag
+from app.core.config import settings
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag derived from the response body, so it agrees across workers."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def precompress(body: bytes) -> Optional[bytes]:
+    """gzip a body that is about to be cached, if the middleware would compress it."""
+    if not settings.COMPRESSION_ENABLED or len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return None
+    return gzip_body(body, settings.COMPRESSION_LEVEL)
+
+
+def json_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    headers: Optional[dict] = None,
+    gzipped: Optional[bytes] = None,
+) -> Response:
+    """Serve pre-serialized JSON, answering 304 when the client's copy is current.
+
+    `gzipped` is the body precompressed by precompress(); it is sent as is to
+    clients that accept gzip, so the compression middleware skips it.
+    """
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "no-cache"}
+    use_gzip = gzipped is not None and accepts_gzip(request.headers.get("accept-encoding"))
+    if gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        headers["ETag"] = weak_etag(etag)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzipped, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,56 @@
+"""Read-your-writes marker carried by the client.
+
+A successful write (any non-GET request) answers with an ``X-Last-Write``
+header holding the time of the write, and the client sends the latest value
+back on every request. get_read_db sends requests that still carry a fresh
+marker to the primary, so a write handled by one worker process followed by a
+read on another never reaches a lagging replica.
+
+A header is used rather than a cookie because the frontend and the API are
+usually on different sites (localhost:5173 and 127.0.0.1:8000 in
+development), where browsers do not send SameSite=Lax cookies on fetches.
+
+Kept free of Starlette and application settings so it can be tested alone.
+"""
+import time
+from typing import Optional
+
+LAST_WRITE_HEADER = "X-Last-Write"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def wrote_recently(marker: Optional[str], window: float, now: Optional[float] = None) -> bool:
+    """Whether an X-Last-Write value is within `window` seconds of now.
+
+    The client keeps echoing its latest marker, so the age check is what
+    eventually sends it back to the replica.
+    """
+    try:
+        written_at = float(marker)
+    except (TypeError, ValueError):
+        return False
+    now = time.time() if now is None else now
+    # Tolerate the clock skew between worker hosts in both directions
+    return abs(now - written_at) < window
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that sets the X-Last-Write header on successful writes."""
+
+    def __init__(self, app, window: int):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                marker = f"{time.time():.3f}".encode("latin-1")
+                headers = [*(message.get("headers") or []), (LAST_WRITE_HEADER.lower().encode("latin-1"), marker)]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
@@ -1,19 +1,21 @@
 from fastapi import Depends, HTTPException, status
-from app.api.deps import get_current_active_user
-from app.models.user import User, UserRole
+from app.api.deps import get_current_principal
+from app.models.user import UserRole
+from app.schemas.user import Principal
 from typing import List
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[UserRole]):
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, user: User = Depends(get_current_active_user)) -> bool:
-        if not user:
+    async def __call__(self, principal: Principal = Depends(get_current_principal)) -> bool:
+        # Role comes from the verified token claims, so no user row is needed here
+        if not principal:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Authentication required"
             )
-        if user.role not in self.allowed_roles:
+        if principal.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"This action requires one of these roles: {[role.value for role in self.allowed_roles]}"
@@ -1,6 +1,6 @@
 
 from fastapi import APIRouter
-from app.api.routes import auth, courses, lessons, enrollments, reviews, users, certificates, quizzes, leaderboard, reports
+from app.api.routes import auth, courses, lessons, enrollments, reviews, users, certificates, quizzes, leaderboard, reports, diagnostics
 
 api_router = APIRouter()
 
@@ -14,3 +14,4 @@ api_router.include_router(certificates.router, prefix="", tags=["certificates"])
 api_router.include_router(quizzes.router, prefix="", tags=["quizzes"])
 api_router.include_router(leaderboard.router, prefix="", tags=["leaderboard"])
 api_router.include_router(reports.router, prefix="", tags=["reports"])
+api_router.include_router(diagnostics.router, prefix="", tags=["diagnostics"])
@@ -1,19 +1,42 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
 
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    hash_refresh_token,
+    password_service,
+)
 from app.core.config import settings
+from app.core.token_versions import token_versions
 from app.db.base import get_db
 from app.models.user import User, UserRole
-from app.schemas.user import User as UserSchema, UserCreate, Token
+from app.models.user_session import UserSession
+from app.schemas.user import User as UserSchema, UserCreate, Token, RefreshTokenRequest
 from app.api.deps import get_current_active_user
 
 router = APIRouter(tags=["auth"])
 
+
+async def _start_session(db: AsyncSession, user_id: int) -> str:
+    """Persist a new refresh token for the user and return it; the caller commits."""
+    now = datetime.utcnow()
+    # Opportunistically drop this user's expired sessions (indexed on user_id)
+    await db.execute(
+        delete(UserSession).where(UserSession.user_id == user_id, UserSession.expires_at <= now)
+    )
+    refresh_token, token_hash = create_refresh_token()
+    db.add(UserSession(
+        user_id=user_id,
+        token_hash=token_hash,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return refresh_token
+
 @router.post("/login", response_model=Token)
 async def login(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -21,7 +44,7 @@ async def login(
 ) -> Token:
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await password_service.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -30,13 +53,19 @@ async def login(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=str(user.id), expires_delta=access_token_expires
+        subject=str(user.id),
+        expires_delta=access_token_expires,
+        role=user.role.value,
+        token_version=user.token_version,
     )
+    refresh_token = await _start_session(db, user.id)
+    await db.commit()
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
         "user": {
             "id": user.id,
             "email": user.email,
@@ -60,25 +89,33 @@ async def register(
             detail="A user with this email already exists."
         )
     
+    hashed_password = await password_service.hash(password)
     db_user = User(
         email=email,
         full_name=full_name,
-        hashed_password=get_password_hash(password),
+        hashed_password=hashed_password,
         role=UserRole.STUDENT
     )
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
+    token_versions.update(db_user.id, db_user.token_version, db_user.role)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=str(db_user.id), expires_delta=access_token_expires
+        subject=str(db_user.id),
+        expires_delta=access_token_expires,
+        role=db_user.role.value,
+        token_version=db_user.token_version,
     )
+    refresh_token = await _start_session(db, db_user.id)
+    await db.commit()
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
         "user": {
             "id": db_user.id,
             "email": db_user.email,
@@ -87,6 +124,77 @@ async def register(
         }
     }
 
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    body: RefreshTokenRequest,
+):
+    """Exchange a refresh token for a new access token, rotating the refresh token.
+
+    Renewal is one indexed lookup on the token hash plus a conditional update;
+    no password verification is involved.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token_hash = hash_refresh_token(body.refresh_token)
+    result = await db.execute(
+        select(UserSession.id, UserSession.user_id, UserSession.expires_at)
+        .where(UserSession.token_hash == token_hash)
+    )
+    session_row = result.one_or_none()
+    if session_row is None:
+        raise invalid_exception
+    now = datetime.utcnow()
+    if session_row.expires_at <= now:
+        await db.execute(delete(UserSession).where(UserSession.id == session_row.id))
+        await db.commit()
+        raise invalid_exception
+
+    entry = await token_versions.lookup(session_row.user_id)
+    if entry is None:
+        raise invalid_exception
+    token_version, role = entry
+
+    # Rotate: the presented token stops working. Matching on the old hash makes
+    # concurrent refreshes with the same token race safely (only one wins).
+    new_refresh_token, new_hash = create_refresh_token()
+    result = await db.execute(
+        update(UserSession)
+        .where(UserSession.id == session_row.id, UserSession.token_hash == token_hash)
+        .values(token_hash=new_hash, expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+    )
+    if result.rowcount != 1:
+        raise invalid_exception
+    await db.commit()
+
+    access_token = create_access_token(
+        subject=str(session_row.user_id),
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        role=role.value,
+        token_version=token_version,
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": new_refresh_token,
+    }
+
+@router.post("/logout")
+async def logout(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    body: RefreshTokenRequest,
+) -> dict:
+    """Revoke a refresh token. Outstanding access tokens expire on their own."""
+    await db.execute(
+        delete(UserSession).where(UserSession.token_hash == hash_refresh_token(body.refresh_token))
+    )
+    await db.commit()
+    return {"ok": True}
+
 @router.get("/me")
 async def read_users_me(
     current_user: Annotated[User, Depends(get_current_active_user)]
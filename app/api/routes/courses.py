@@ -1,12 +1,19 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated, List, Optional, Tuple
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import literal, select, tuple_, union_all
+from sqlalchemy.orm import joinedload
 
-from app.api.deps import get_current_active_user, get_current_user_optional
+from app.api.deps import get_current_active_user, get_current_user_optional, get_read_db
+from app.api.http_cache import etag_for, json_response, precompress
 from app.api.role_checker import RoleChecker
-from app.db.base import get_db
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.cache import catalog_cache, catalog_version, course_outline_cache, course_versions
+from app.core.course_facets import course_facets
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.db import course_search
+from app.db.base import async_primary_read_session, get_db
 from app.models.user import User, UserRole
 from app.models.course import Course
 from app.models.enrollment import Enrollment
@@ -19,12 +26,18 @@ from app.schemas.course import (
     CourseUpdate,
     CourseWithStats
 )
+from app.schemas import serializers
 
 router = APIRouter()
 
+# Keyset sort key per order_by, next to the type its cursor value decodes to.
+# Each ordering is (key DESC, id DESC), backed by a composite index.
+_CURSOR_TYPES = {"newest": datetime, "rating": float, "popularity": int}
+
+
 @router.get("", response_model=List[CourseSchema])
 async def list_courses(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     category: str = None,
@@ -32,9 +45,78 @@ async def list_courses(
     min_price: float = None,
     max_price: float = None,
     search: str = None,
-    order_by: str = Query("newest", pattern=r"^(newest|popularity|rating)$")
-) -> List[Course]:
+    order_by: str = Query("newest", pattern=r"^(newest|popularity|rating|relevance)$"),
+    cursor: str = Query(None, description="Value of X-Next-Cursor from the previous page; replaces skip"),
+) -> Response:
+    # Search is case-insensitive on every backend, so normalize it for the key
+    if search is not None:
+        search = " ".join(search.lower().split()) or None
+    key = (
+        catalog_version.value, order_by, cursor, 0 if cursor else skip, limit,
+        category, level, min_price, max_price, search,
+    )
+    entry = catalog_cache.get(key)
+    if entry is None:
+        after = None
+        if cursor:
+            if order_by == "relevance":
+                raise HTTPException(status_code=400, detail="Cursor pagination is not supported for order_by=relevance")
+            try:
+                after = decode_cursor(cursor, order_by, (_CURSOR_TYPES[order_by], int))
+            except InvalidCursor as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+        if catalog_snapshot is not None and not search and order_by != "relevance":
+            courses, next_cursor = await catalog_snapshot.page(
+                order_by, skip, limit, category, level, min_price, max_price, after
+            )
+        else:
+            # Filled from the primary: the entry is shared by every caller until
+            # the next catalog write, so replica lag must not end up in it
+            async with async_primary_read_session() as primary:
+                courses, next_cursor = await _query_catalog(
+                    primary, skip, limit, category, level, min_price, max_price, search, order_by, after
+                )
+        body = serializers.dump_json(serializers.course_list, courses)
+        # Compressed once here rather than by the middleware on every hit
+        entry = (body, etag_for(body), next_cursor, precompress(body))
+        catalog_cache.set(key, entry)
+
+    body, etag, next_cursor, gzipped = entry
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return json_response(request, body, etag, headers, gzipped)
+
+
+@router.get("/facets")
+async def get_course_facets(
+    category: str = None,
+    level: str = None,
+    min_price: float = None,
+    max_price: float = None,
+) -> dict:
+    """Counts per category, level and price bucket for published courses.
+
+    Served from the in-memory facet index; declared before /{course_id} so
+    "facets" is not parsed as a course id.
+    """
+    return await course_facets.counts(category, level, min_price, max_price)
+
+
+async def _query_catalog(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    category: Optional[str],
+    level: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    search: Optional[str],
+    order_by: str,
+    after: Optional[tuple],
+) -> Tuple[List[Course], Optional[str]]:
+    """One page of published courses and the cursor for the next page, if any."""
     query = select(Course).where(Course.is_published == True)
+    relevance = None
     
     if category:
         query = query.where(Course.category == category)
@@ -45,29 +127,38 @@ async def list_courses(
     if max_price is not None:
         query = query.where(Course.price <= max_price)
     if search:
-        search_filter = (
-            Course.title.ilike(f"%{search}%") |
-            Course.description.ilike(f"%{search}%")
-        )
-        query = query.where(search_filter)
+        backend = await course_search.detect_backend(db)
+        query, relevance = course_search.apply_search(query, Course, search, backend)
     
+    if order_by == "relevance":
+        if relevance is not None:
+            query = query.order_by(relevance, Course.created_at.desc(), Course.id.desc())
+        else:
+            query = query.order_by(Course.created_at.desc(), Course.id.desc())
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all(), None
+
     if order_by == "newest":
-        query = query.order_by(Course.created_at.desc())
+        sort_key = Course.created_at
     elif order_by == "popularity":
-        subquery = (
-            select(Course.id, func.count(Enrollment.id).label("enrollment_count"))
-            .outerjoin(Enrollment)
-            .group_by(Course.id)
-            .subquery()
-        )
-        query = query.outerjoin(subquery, Course.id == subquery.c.id)
-        query = query.order_by(subquery.c.enrollment_count.desc())
+        sort_key = Course.enrollment_count
     else:  # rating
-        query = query.order_by(Course.average_rating.desc())
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+        sort_key = Course.average_rating
+
+    query = query.add_columns(sort_key).order_by(sort_key.desc(), Course.id.desc())
+    if after is not None:
+        query = query.where(tuple_(sort_key, Course.id) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+
+    # One extra row tells whether there is a next page
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_course, last_key = rows[-1]
+        next_cursor = encode_cursor(order_by, last_key, last_course.id)
+    return [course for course, _ in rows], next_cursor
 
 @router.post("", response_model=CourseSchema)
 async def create_course(
@@ -83,94 +174,81 @@ async def create_course(
     db_course = Course(**course_data, instructor_id=current_user.id)
     db.add(db_course)
     await db.commit()
+    catalog_version.bump()
     await db.refresh(db_course)
+    course_facets.upsert(db_course)
     return db_course
 
 @router.get("/{course_id}")
 async def get_course(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     course_id: int,
     current_user: Annotated[User | None, Depends(get_current_user_optional)] = None
-) -> dict:
-    # eager-load instructor to avoid lazy-loading from the ORM which can
-    # attempt synchronous IO and trigger MissingGreenlet in async contexts
-    result = await db.execute(
-        select(Course).options(selectinload(Course.instructor)).where(Course.id == course_id)
-    )
-    course = result.scalar_one_or_none()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
+) -> Response:
+    key = (course_id, course_versions.get(course_id))
+    outline = course_outline_cache.get(key)
+    if outline is None:
+        # Filled from the primary: a miss usually follows a write, and replica
+        # lag cached under the new version would be served for the whole TTL
+        async with async_primary_read_session() as primary:
+            outline = await _load_course_outline(primary, course_id)
+        if outline is None:
+            raise HTTPException(status_code=404, detail="Course not found")
+        course_outline_cache.set(key, outline)
 
     # Check publication permissions
-    if not course.is_published:
-        if current_user is None or (current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN):
+    if not outline["is_published"]:
+        if current_user is None or (current_user.id != outline["instructor_id"] and current_user.role != UserRole.ADMIN):
             raise HTTPException(status_code=403, detail="Course not published")
 
-    # Load lessons for course
-    lessons_q = select(Lesson).where(Lesson.course_id == course_id).order_by(Lesson.order_index)
-    res = await db.execute(lessons_q)
-    lessons = res.scalars().all()
-    lesson_ids = [l.id for l in lessons]
-
-    # Completed lessons for current user
+    is_enrolled = False
     completed_set = set()
     if current_user:
-        if lesson_ids:
-            res = await db.execute(
-                select(LessonCompletion.lesson_id).where(
-                    LessonCompletion.user_id == current_user.id,
-                    LessonCompletion.lesson_id.in_(lesson_ids)
-                )
-            )
-            completed_set = {row[0] for row in res.fetchall()}
+        is_enrolled, completed_set = await _load_user_course_state(db, current_user.id, course_id, outline["lesson_ids"])
+
+    payload = {k: v for k, v in outline.items() if k != "lesson_ids"}
+    payload["lessons"] = [{**lesson, "completed": lesson["id"] in completed_set} for lesson in outline["lessons"]]
+    payload["is_enrolled"] = is_enrolled
+    payload["completed_lessons"] = len(completed_set) if is_enrolled else 0
+    return serializers.ORJSONResponse(payload)
 
-    # ...no quiz functionality...
 
-    # Build lessons payload compatible with frontend expectations
+async def _load_course_outline(db: AsyncSession, course_id: int) -> Optional[dict]:
+    """The user-independent part of the course detail payload."""
+    # eager-load instructor to avoid lazy-loading from the ORM which can
+    # attempt synchronous IO and trigger MissingGreenlet in async contexts
+    result = await db.execute(
+        select(Course).options(joinedload(Course.instructor)).where(Course.id == course_id)
+    )
+    course = result.scalar_one_or_none()
+    if not course:
+        return None
+
+    res = await db.execute(
+        select(Lesson.id, Lesson.title, Lesson.duration_seconds, Lesson.order_index)
+        .where(Lesson.course_id == course_id)
+        .order_by(Lesson.order_index)
+    )
+    lessons = res.all()
+
+    # Build lessons payload compatible with frontend expectations; next_lesson_id
+    # lets the frontend request specific lesson details separately
     lessons_payload = []
-    for i, l in enumerate(lessons):
+    for idx, l in enumerate(lessons):
         lessons_payload.append({
             "id": l.id,
             "title": l.title,
             "duration": (l.duration_seconds // 60) if l.duration_seconds else 0,
-            "index": l.order_index,
-            "completed": l.id in completed_set,
+            "index": idx,
+            "order_index": l.order_index,
+            "next_lesson_id": lessons[idx + 1].id if idx + 1 < len(lessons) else None,
         })
 
-    # Compute next_lesson ids for listing (frontend may request specific lesson details separately)
-    for idx, lp in enumerate(lessons_payload):
-        lp["next_lesson_id"] = lessons_payload[idx + 1]["id"] if idx + 1 < len(lessons_payload) else None
-
-    # Enrollment info
-    is_enrolled = False
-    completed_lessons = 0
-    total_lessons = len(lessons_payload)
-    if current_user:
-        res = await db.execute(
-            select(Enrollment).where(
-                Enrollment.course_id == course_id,
-                Enrollment.user_id == current_user.id
-            )
-        )
-        enrollment = res.scalar_one_or_none()
-        is_enrolled = enrollment is not None
-        if is_enrolled:
-            # Count completed lessons
-            res = await db.execute(
-                select(func.count(LessonCompletion.id)).where(
-                    LessonCompletion.user_id == current_user.id,
-                    LessonCompletion.lesson_id.in_(lesson_ids)
-                )
-            )
-            completed_lessons = res.scalar_one() or 0
-
-    # Total duration in minutes
-    total_duration = sum((l.duration_seconds or 0) for l in lessons) // 60
-
     instructor_name = getattr(course.instructor, 'full_name', None) or getattr(course.instructor, 'email', None)
 
-    payload = {
+    return {
         "id": course.id,
+        "instructor_id": course.instructor_id,
         "title": course.title,
         "subtitle": course.subtitle,
         "description": course.description,
@@ -185,14 +263,32 @@ async def get_course(
         "updated_at": course.updated_at,
         "average_rating": course.average_rating,
         "instructor_name": instructor_name,
-        "is_enrolled": is_enrolled,
-        "completed_lessons": completed_lessons,
-        "total_lessons": total_lessons,
-        "total_duration": total_duration,
+        "total_lessons": len(lessons_payload),
+        # Total duration in minutes
+        "total_duration": sum((l.duration_seconds or 0) for l in lessons) // 60,
         "lessons": lessons_payload,
+        "lesson_ids": [l.id for l in lessons],
     }
 
-    return payload
+
+async def _load_user_course_state(
+    db: AsyncSession, user_id: int, course_id: int, lesson_ids: List[int]
+) -> Tuple[bool, set]:
+    """Enrollment flag and completed lesson ids for one user, in a single query."""
+    enrolled = select(Enrollment.course_id.label("id"), literal("enrolled").label("kind")).where(
+        Enrollment.user_id == user_id,
+        Enrollment.course_id == course_id,
+    )
+    query = enrolled
+    if lesson_ids:
+        completed = select(LessonCompletion.lesson_id.label("id"), literal("completed").label("kind")).where(
+            LessonCompletion.user_id == user_id,
+            LessonCompletion.lesson_id.in_(lesson_ids),
+        )
+        query = union_all(enrolled, completed)
+    rows = (await db.execute(query)).all()
+    is_enrolled = any(kind == "enrolled" for _, kind in rows)
+    return is_enrolled, {row_id for row_id, kind in rows if kind == "completed"}
 
 @router.put("/{course_id}", response_model=CourseSchema)
 async def update_course(
@@ -213,7 +309,10 @@ async def update_course(
         setattr(course, field, value)
     
     await db.commit()
+    catalog_version.bump()
+    course_versions.bump(course_id)
     await db.refresh(course)
+    course_facets.upsert(course)
     return course
 
 @router.delete("/{course_id}")
@@ -232,4 +331,7 @@ async def delete_course(
     
     await db.delete(course)
     await db.commit()
+    catalog_version.bump()
+    course_versions.bump(course_id)
+    course_facets.discard(course_id)
     return {"ok": True}
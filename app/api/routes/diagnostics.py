@@ -0,0 +1,61 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_superuser
+from app.core.cache import catalog_cache, course_access_cache, principal_cache
+from app.core.config import settings
+from app.db.base import get_db, database_diagnostics
+from app.db.maintenance import REPAIR_ENROLLMENT_COUNTS
+from app.db.slow_queries import slow_query_log
+
+router = APIRouter()
+
+
+@router.get("/admin/diagnostics/principal-cache")
+async def principal_cache_stats(_=Depends(get_current_active_superuser)) -> dict:
+    """Hit/miss counters for the authenticated-user cache."""
+    return principal_cache.stats()
+
+
+@router.get("/admin/diagnostics/catalog-cache")
+async def catalog_cache_stats(_=Depends(get_current_active_superuser)) -> dict:
+    """Hit/miss counters for the serialized course catalog cache."""
+    return catalog_cache.stats()
+
+
+@router.get("/admin/diagnostics/course-access-cache")
+async def course_access_cache_stats(_=Depends(get_current_active_superuser)) -> dict:
+    """Hit/miss counters for the per-(user, course) lesson gating cache."""
+    return course_access_cache.stats()
+
+
+@router.get("/admin/diagnostics/database")
+async def database_settings(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _=Depends(get_current_active_superuser),
+) -> dict:
+    """Effective connection pool options and, on SQLite, the pragmas in force."""
+    return await database_diagnostics(db)
+
+
+@router.get("/admin/diagnostics/slow-queries")
+async def slow_queries(_=Depends(get_current_active_superuser)) -> dict:
+    """Most recent statements over SLOW_QUERY_THRESHOLD_MS, newest first."""
+    return {
+        "enabled": settings.SLOW_QUERY_LOG,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "entries": slow_query_log.entries(),
+    }
+
+
+@router.post("/admin/diagnostics/repair-enrollment-counts")
+async def repair_enrollment_counts(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _=Depends(get_current_active_superuser),
+) -> dict:
+    """Recount course.enrollment_count where it has drifted from the enrollment table."""
+    result = await db.execute(text(REPAIR_ENROLLMENT_COUNTS))
+    await db.commit()
+    return {"repaired": result.rowcount}
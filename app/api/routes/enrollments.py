@@ -1,9 +1,11 @@
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
+from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import get_current_active_user
+from app.core.cache import enrollment_version
 from app.db.base import get_db
 from app.models.user import User
 from app.models.course import Course
@@ -16,6 +18,7 @@ from app.schemas.enrollment import (
     EnrollmentCreate,
     EnrollmentWithProgress
 )
+from app.schemas import serializers
 
 router = APIRouter()
 
@@ -53,7 +56,21 @@ async def enroll_in_course(
         course_id=course_id
     )
     db.add(db_enrollment)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Lost a race with a concurrent enroll request for the same user
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    # Atomic increment in the same transaction as the insert
+    await db.execute(
+        update(Course)
+        .where(Course.id == course_id)
+        .values(enrollment_count=Course.enrollment_count + 1, updated_at=Course.updated_at)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
+    enrollment_version.bump()  # enrollment_count changed
     await db.refresh(db_enrollment)
     # Build a plain serializable dict to return. Returning the SQLAlchemy
     # ORM object directly can cause Pydantic to access relationship
@@ -93,7 +110,7 @@ async def enroll_in_course(
 async def get_my_enrollments(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)]
-) -> List[Enrollment]:
+) -> Response:
     # Get enrollments with progress info
     # Select the Enrollment and its related Course plus aggregated lesson counts
     # Count lessons and completions via aggregation; use correlated scalar subqueries
@@ -197,7 +214,8 @@ async def get_my_enrollments(
         progress = EnrollmentWithProgress(**enrollment_data)
         enrollments_with_progress.append(progress)
 
-    return enrollments_with_progress
+    # Already validated above; serialize the models directly
+    return serializers.json_response(serializers.enrollment_progress_list, enrollments_with_progress)
 
 @router.post("/courses/{course_id}/lessons/{lesson_id}/complete")
 async def complete_lesson(
@@ -207,18 +225,18 @@ async def complete_lesson(
     current_user: Annotated[User, Depends(get_current_active_user)]
 ) -> dict:
     # Check if lesson exists
-    result = await db.execute(select(Lesson).where(Lesson.id == lesson_id))
-    lesson = result.scalar_one_or_none()
-    if not lesson:
+    result = await db.execute(select(Lesson.course_id).where(Lesson.id == lesson_id))
+    lesson_course_id = result.scalar_one_or_none()
+    if lesson_course_id is None:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    if lesson.course_id != course_id:
+    if lesson_course_id != course_id:
         raise HTTPException(status_code=404, detail="Lesson not found in this course")
     
     # Check if user is enrolled in the course
     result = await db.execute(
         select(Enrollment)
         .where(
-            Enrollment.course_id == lesson.course_id,
+            Enrollment.course_id == course_id,
             Enrollment.user_id == current_user.id
         )
     )
@@ -246,6 +264,12 @@ async def complete_lesson(
         lesson_id=lesson_id
     )
     db.add(completion)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Lost a race with a concurrent completion of the same lesson
+        await db.rollback()
+        return {"message": "Lesson already completed"}
     
     # Update enrollment's last_lesson_id
     enrollment.last_lesson_id = lesson_id
@@ -2,7 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db
+from app.api.deps import get_read_db
 from app.models.user import User
 from app.models.lesson_completion import LessonCompletion
 from app.models.quiz import QuizAttempt
@@ -11,7 +11,7 @@ router = APIRouter(tags=["leaderboard"])
 
 
 @router.get("/leaderboard/global")
-async def global_leaderboard(db: AsyncSession = Depends(get_db)) -> List[dict]:
+async def global_leaderboard(db: AsyncSession = Depends(get_read_db)) -> List[dict]:
     """
     Return players with computed points sorted desc.
 
@@ -1,66 +1,155 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, List, Literal, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import and_, case, false, select, desc, func, update
 
 from app.api.deps import get_current_active_user
 from app.api.role_checker import RoleChecker
-from app.db.base import get_db
+from app.core.cache import course_versions
+from app.core.course_access import CourseAccess, get_course_access, is_enrolled
+from app.core.lesson_order import GAP, key_between, needs_rebalance, spaced_keys
+from app.db.base import async_session, get_db
 from app.models.user import User, UserRole
 from app.models.course import Course
 from app.models.lesson import Lesson
-from app.models.enrollment import Enrollment
+from app.models.lesson_completion import LessonCompletion
+from app.schemas import serializers
 from app.schemas.lesson import (
     Lesson as LessonSchema,
+    LessonOutline,
     LessonCreate,
     LessonUpdate,
-    LessonOrderUpdate
+    LessonOrderUpdate,
+    LessonMove
 )
 
 router = APIRouter()
 
-@router.get("/{course_id}/lessons", response_model=List[LessonSchema])
+
+async def _allocate_tail_key(db: AsyncSession, course_id: int) -> int:
+    """Reserve the key after the course's last lesson with one atomic UPDATE."""
+    result = await db.execute(
+        update(Course)
+        .where(Course.id == course_id)
+        .values(lesson_order_tail=Course.lesson_order_tail + GAP, updated_at=Course.updated_at)
+        .returning(Course.lesson_order_tail)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
+async def _raise_tail(db: AsyncSession, course_id: int, key: int) -> None:
+    """Keep lesson_order_tail at or above a key written by the client."""
+    await db.execute(
+        update(Course)
+        .where(Course.id == course_id, Course.lesson_order_tail < key)
+        .values(lesson_order_tail=key, updated_at=Course.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _rebalance(db: AsyncSession, course_id: int) -> None:
+    """Respace a course's lessons to GAP, 2*GAP, ... in their current order."""
+    result = await db.execute(
+        select(Lesson.id)
+        .where(Lesson.course_id == course_id)
+        .order_by(Lesson.order_index, Lesson.id)
+    )
+    lesson_ids = result.scalars().all()
+    keys = spaced_keys(len(lesson_ids))
+    if lesson_ids:
+        await db.execute(
+            update(Lesson)
+            .where(Lesson.id.in_(lesson_ids))
+            .values(order_index=case(dict(zip(lesson_ids, keys)), value=Lesson.id))
+            .execution_options(synchronize_session=False)
+        )
+    await db.execute(
+        update(Course)
+        .where(Course.id == course_id)
+        .values(lesson_order_tail=keys[-1] if keys else 0, updated_at=Course.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rebalance_lessons(course_id: int) -> None:
+    """Background task: rebalance a course whose keys are running out of room."""
+    async with async_session() as db:
+        await db.execute(select(Course.id).where(Course.id == course_id).with_for_update())
+        await _rebalance(db, course_id)
+        await db.commit()
+    course_versions.bump(course_id)
+
+
+async def _neighbour_keys(
+    db: AsyncSession, course_id: int, lesson_id: int, after_lesson_id: Optional[int]
+) -> tuple[Optional[int], Optional[int]]:
+    """Keys of the lessons the moved lesson will sit between (None at either end)."""
+    before = None
+    if after_lesson_id is not None:
+        before = await db.scalar(
+            select(Lesson.order_index)
+            .where(Lesson.id == after_lesson_id, Lesson.course_id == course_id)
+        )
+        if before is None:
+            raise HTTPException(status_code=404, detail=f"Lesson {after_lesson_id} not found in this course")
+    query = select(func.min(Lesson.order_index)).where(
+        Lesson.course_id == course_id,
+        Lesson.id != lesson_id,
+    )
+    if before is not None:
+        query = query.where(Lesson.order_index > before)
+    after = await db.scalar(query)
+    return before, after
+
+
+@router.get("/{course_id}/lessons", response_model=Union[List[LessonOutline], List[LessonSchema]])
 async def list_course_lessons(
     db: Annotated[AsyncSession, Depends(get_db)],
     course_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)] = None
-) -> List[Lesson]:
+    current_user: Annotated[User, Depends(get_current_active_user)] = None,
+    # "outline" (default) never reads lesson content; "full" returns whole lessons
+    view: Literal["outline", "full"] = "outline"
+):
     # Check if course exists and is published
-    result = await db.execute(select(Course).where(Course.id == course_id))
-    course = result.scalar_one_or_none()
-    if not course:
+    access = await get_course_access(db, course_id, current_user)
+    if not access:
         raise HTTPException(status_code=404, detail="Course not found")
-    
-    # Check if user is enrolled or lesson is preview
-    if not course.is_published and (current_user is None or (current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN)):
+    if not access.can_view_course(current_user):
         raise HTTPException(status_code=403, detail="Course not published")
     
+    # Only return preview lessons for non-enrolled users
+    previews_only = not access.can_view_all_lessons(current_user)
+
+    if view == "full":
+        query = select(Lesson).where(Lesson.course_id == course_id)
+        if previews_only:
+            query = query.where(Lesson.is_preview == True)
+        result = await db.execute(query.order_by(Lesson.order_index))
+        return serializers.json_response(serializers.lesson_list, result.scalars().all())
+
+    # Outline: a column projection, so content is never read from the database
     if current_user:
-        result = await db.execute(
-            select(Enrollment)
-            .where(
-                Enrollment.course_id == course_id,
-                Enrollment.user_id == current_user.id
-            )
-        )
-        enrollment = result.scalar_one_or_none()
-        if not enrollment and current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
-            # Only return preview lessons for non-enrolled users
-            query = select(Lesson).where(
-                Lesson.course_id == course_id,
-                Lesson.is_preview == True
-            )
-        else:
-            query = select(Lesson).where(Lesson.course_id == course_id)
+        completed = LessonCompletion.id.is_not(None)
     else:
-        query = select(Lesson).where(
-            Lesson.course_id == course_id,
-            Lesson.is_preview == True
+        completed = false()
+    query = select(
+        Lesson.id, Lesson.title, Lesson.order_index, Lesson.duration_seconds, Lesson.is_preview,
+        completed.label("completed"),
+    ).where(Lesson.course_id == course_id)
+    if current_user:
+        query = query.outerjoin(
+            LessonCompletion,
+            and_(LessonCompletion.lesson_id == Lesson.id, LessonCompletion.user_id == current_user.id)
         )
-    
-    query = query.order_by(Lesson.order_index)
-    result = await db.execute(query)
-    return result.scalars().all()
+    if previews_only:
+        query = query.where(Lesson.is_preview == True)
+    result = await db.execute(query.order_by(Lesson.order_index))
+    outline = [
+        {**row._mapping, "duration": (row.duration_seconds // 60) if row.duration_seconds else 0}
+        for row in result
+    ]
+    return serializers.json_response(serializers.lesson_outline_list, outline)
 
 @router.post("/{course_id}/lessons", response_model=LessonSchema)
 async def create_lesson(
@@ -78,18 +167,11 @@ async def create_lesson(
     if current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Get the max order_index
-    result = await db.execute(
-        select(func.max(Lesson.order_index))
-        .where(Lesson.course_id == course_id)
-    )
-    max_order = result.scalar_one_or_none() or -1
-    
-    # Create lesson with next order_index. Ensure we don't pass order_index twice
+    # Create lesson after the last one. Ensure we don't pass order_index twice
     lesson_data = lesson_in.model_dump(exclude_unset=True)
     # Remove any order_index provided by the client so server controls ordering
     lesson_data.pop('order_index', None)
-    lesson_data['order_index'] = max_order + 1
+    lesson_data['order_index'] = await _allocate_tail_key(db, course_id)
 
     db_lesson = Lesson(
         **lesson_data,
@@ -97,6 +179,7 @@ async def create_lesson(
     )
     db.add(db_lesson)
     await db.commit()
+    course_versions.bump(course_id)
     await db.refresh(db_lesson)
     return db_lesson
 
@@ -120,10 +203,14 @@ async def update_lesson(
     if current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    for field, value in lesson_in.model_dump(exclude_unset=True).items():
+    lesson_data = lesson_in.model_dump(exclude_unset=True)
+    for field, value in lesson_data.items():
         setattr(lesson, field, value)
+    if lesson_data.get('order_index') is not None:
+        await _raise_tail(db, lesson.course_id, lesson_data['order_index'])
     
     await db.commit()
+    course_versions.bump(lesson.course_id)
     await db.refresh(lesson)
     return lesson
 
@@ -142,31 +229,92 @@ async def reorder_lessons(
     if current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Verify all lessons exist and belong to this course
-    for order in lesson_orders:
-        result = await db.execute(
-            select(Lesson).where(
-                Lesson.id == order.lesson_id,
-                Lesson.course_id == course_id
-            )
+    requested = {order.lesson_id: order.order_index for order in lesson_orders}
+    if len(requested) != len(lesson_orders):
+        raise HTTPException(status_code=400, detail="Duplicate lesson ids in reorder request")
+    if len(set(requested.values())) != len(requested):
+        raise HTTPException(status_code=400, detail="Duplicate order indexes in reorder request")
+
+    # One query validates every id and gives the order of the lessons left untouched
+    result = await db.execute(
+        select(Lesson.id, Lesson.order_index).where(Lesson.course_id == course_id)
+    )
+    current = dict(result.all())
+    missing = sorted(set(requested) - set(current))
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Lessons {', '.join(map(str, missing))} not found in this course"
         )
-        if not result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=404,
-                detail=f"Lesson {order.lesson_id} not found in this course"
-            )
-    
-    # Update order indices
-    for order in lesson_orders:
-        result = await db.execute(
-            select(Lesson).where(Lesson.id == order.lesson_id)
+    untouched = {index for lesson_id, index in current.items() if lesson_id not in requested}
+    clashes = sorted(untouched & set(requested.values()))
+    if clashes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Order indexes {', '.join(map(str, clashes))} are used by lessons not in this request"
         )
-        lesson = result.scalar_one_or_none()
-        lesson.order_index = order.order_index
+
+    # Apply every new index in a single UPDATE ... CASE
+    if requested:
+        await db.execute(
+            update(Lesson)
+            .where(Lesson.id.in_(list(requested)))
+            .values(order_index=case(requested, value=Lesson.id))
+            .execution_options(synchronize_session=False)
+        )
+        await _raise_tail(db, course_id, max(requested.values()))
     
     await db.commit()
+    course_versions.bump(course_id)
     return {"ok": True}
 
+@router.post("/{course_id}/lessons/{lesson_id}/move", response_model=LessonSchema)
+async def move_lesson(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    course_id: int,
+    lesson_id: int,
+    move: LessonMove,
+    background_tasks: BackgroundTasks,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    allowed: Annotated[bool, Depends(RoleChecker([UserRole.ADMIN, UserRole.INSTRUCTOR]))]
+) -> Lesson:
+    # Lock the course row so concurrent moves and rebalances are serialized
+    result = await db.execute(select(Course).where(Course.id == course_id).with_for_update())
+    course = result.scalar_one_or_none()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    result = await db.execute(
+        select(Lesson).where(Lesson.id == lesson_id, Lesson.course_id == course_id)
+    )
+    lesson = result.scalar_one_or_none()
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found in this course")
+    if move.after_lesson_id == lesson_id:
+        raise HTTPException(status_code=400, detail="Cannot move a lesson after itself")
+
+    before, after = await _neighbour_keys(db, course_id, lesson_id, move.after_lesson_id)
+    if after is None:
+        key = await _allocate_tail_key(db, course_id)
+    else:
+        key = key_between(before, after)
+        if key is None:
+            # No room left between the neighbours: respace now, then place
+            await _rebalance(db, course_id)
+            before, after = await _neighbour_keys(db, course_id, lesson_id, move.after_lesson_id)
+            key = key_between(before, after)
+
+    # Only the moved lesson's row changes
+    lesson.order_index = key
+    await db.commit()
+    course_versions.bump(course_id)
+    if after is not None and needs_rebalance(before, key, after):
+        background_tasks.add_task(rebalance_lessons, course_id)
+    await db.refresh(lesson)
+    return lesson
+
 @router.get("/{course_id}/lessons/{lesson_id}", response_model=LessonSchema)
 async def get_lesson(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -174,34 +322,30 @@ async def get_lesson(
     lesson_id: int,
     current_user: Annotated[User, Depends(get_current_active_user)] = None
 ) -> Lesson:
-    result = await db.execute(select(Lesson).where(Lesson.id == lesson_id))
-    lesson = result.scalar_one_or_none()
-    if not lesson:
+    # The lesson and its course's gating columns in one primary-key lookup
+    result = await db.execute(
+        select(Lesson, Course.instructor_id, Course.is_published)
+        .join(Course, Course.id == Lesson.course_id)
+        .where(Lesson.id == lesson_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Lesson not found")
+    lesson = row.Lesson
     
     # Ensure the lesson belongs to the requested course (route consistency)
     if lesson.course_id != course_id:
         raise HTTPException(status_code=404, detail="Lesson not found in this course")
 
-    result = await db.execute(select(Course).where(Course.id == lesson.course_id))
-    course = result.scalar_one_or_none()
-    
-    if not course.is_published and (current_user is None or (current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN)):
+    access = CourseAccess(row.instructor_id, row.is_published, is_enrolled=False)
+    if not access.can_view_course(current_user):
         raise HTTPException(status_code=403, detail="Course not published")
     
     if not lesson.is_preview:
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
-        
-        result = await db.execute(
-            select(Enrollment)
-            .where(
-                Enrollment.course_id == course.id,
-                Enrollment.user_id == current_user.id
-            )
-        )
-        enrollment = result.scalar_one_or_none()
-        if not enrollment and current_user.id != course.instructor_id and current_user.role != UserRole.ADMIN:
+        # Enrollment is checked last and only when it matters; positives are cached
+        if not access.is_staff(current_user) and not await is_enrolled(db, course_id, current_user.id):
             raise HTTPException(
                 status_code=403,
                 detail="Must be enrolled to access this lesson"
@@ -2,14 +2,16 @@ from typing import Annotated, List
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import OperationalError
 from app.api.deps import get_current_active_user, get_current_user_optional, get_current_instructor_or_admin
 from app.db.base import get_db
 from app.models.quiz import Quiz as QuizModel, Question, Option, QuizAttempt, UserAnswer
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.schemas.user import Principal
 from app.models.enrollment import Enrollment
+from app.schemas import serializers
 from app.schemas.quiz import (
     QuizCreate,
     Quiz as QuizSchema,
@@ -27,48 +29,66 @@ async def create_quiz(
     course_id: int,
     quiz_in: QuizCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_instructor_or_admin)],
+    current_user: Annotated[Principal, Depends(get_current_instructor_or_admin)],
 ):
     """Create a quiz for a course. Instructors/Admins only."""
     db_quiz = QuizModel(title=quiz_in.title, course_id=course_id, allow_retry=bool(quiz_in.allow_retry))
     db.add(db_quiz)
     await db.flush()
 
-    # create optional questions/options
-    if quiz_in.questions:
-        for q in quiz_in.questions:
-            db_q = Question(quiz_id=db_quiz.id, text=q.text, order_index=q.order_index)
-            db.add(db_q)
-            await db.flush()
-            for o in q.options:
-                db_o = Option(question_id=db_q.id, text=o.text, is_correct=bool(o.is_correct))
-                db.add(db_o)
-
+    questions = await _insert_questions(db, db_quiz.id, quiz_in.questions or [])
     await db.commit()
-    # Reload quiz with its questions and options in a single, synchronous-safe way
-    await db.refresh(db_quiz)
-    # Build a plain dict to return so Pydantic doesn't attempt lazy-loading on ORM relationships
-    quiz_payload = {
+    # Built from what was just written, so no reload of the quiz tree is needed
+    return {
         'id': db_quiz.id,
         'course_id': db_quiz.course_id,
         'title': db_quiz.title,
         'allow_retry': db_quiz.allow_retry,
         'created_at': db_quiz.created_at,
-        'updated_at': getattr(db_quiz, 'updated_at', None),
-        'questions': []
+        'questions': questions,
     }
-    # Eager-load questions and their options to avoid lazy-loading after session commit
-    from sqlalchemy.orm import selectinload
-    q_res = await db.execute(select(QuizModel).options(selectinload(QuizModel.questions).selectinload(Question.options)).where(QuizModel.id == db_quiz.id))
-    quiz_obj = q_res.scalar_one_or_none()
-    if quiz_obj:
-        for q in quiz_obj.questions:
-            opts = []
-            for o in q.options:
-                opts.append({'id': o.id, 'text': o.text, 'is_correct': o.is_correct})
-            quiz_payload['questions'].append({'id': q.id, 'text': q.text, 'order_index': q.order_index, 'options': opts})
 
-    return quiz_payload
+
+async def _insert_questions(db: AsyncSession, quiz_id: int, questions_in: List[QuestionCreate]) -> List[dict]:
+    """Bulk insert questions and their options, returning them as response dicts.
+
+    One INSERT .. RETURNING for all questions and one for all options, instead
+    of a flush per question.
+    """
+    if not questions_in:
+        return []
+    q_res = await db.execute(
+        insert(Question).returning(Question.id, sort_by_parameter_order=True),
+        [{'quiz_id': quiz_id, 'text': q.text, 'order_index': q.order_index} for q in questions_in],
+    )
+    question_ids = q_res.scalars().all()
+
+    option_rows = [
+        {'question_id': q_id, 'text': o.text, 'is_correct': bool(o.is_correct)}
+        for q_id, q in zip(question_ids, questions_in)
+        for o in q.options
+    ]
+    option_ids = []
+    if option_rows:
+        o_res = await db.execute(
+            insert(Option).returning(Option.id, sort_by_parameter_order=True),
+            option_rows,
+        )
+        option_ids = o_res.scalars().all()
+
+    payload = []
+    option_id_iter = iter(option_ids)
+    for q_id, q in zip(question_ids, questions_in):
+        payload.append({
+            'id': q_id,
+            'text': q.text,
+            'order_index': q.order_index,
+            'options': [
+                {'id': next(option_id_iter), 'text': o.text, 'is_correct': bool(o.is_correct)}
+                for o in q.options
+            ],
+        })
+    return payload
 
 
 @router.post("/quizzes/{quiz_id}/questions", response_model=dict)
@@ -76,7 +96,7 @@ async def add_question(
     quiz_id: int,
     q_in: QuestionCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_instructor_or_admin)],
+    current_user: Annotated[Principal, Depends(get_current_instructor_or_admin)],
 ):
     """Add a question with options to an existing quiz."""
     result = await db.execute(select(QuizModel).where(QuizModel.id == quiz_id))
@@ -84,14 +104,9 @@ async def add_question(
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    db_q = Question(quiz_id=quiz_id, text=q_in.text, order_index=q_in.order_index)
-    db.add(db_q)
-    await db.flush()
-    for o in q_in.options:
-        db_o = Option(question_id=db_q.id, text=o.text, is_correct=bool(o.is_correct))
-        db.add(db_o)
+    questions = await _insert_questions(db, quiz_id, [q_in])
     await db.commit()
-    return {"ok": True, "question_id": db_q.id}
+    return {"ok": True, "question_id": questions[0]['id']}
 
 
 @router.get("/courses/{course_id}/quizzes", response_model=List[QuizPublic])
@@ -108,7 +123,7 @@ async def get_course_quizzes(
     quizzes = res.scalars().all()
 
     out = []
-    is_instructor = current_user and getattr(current_user, 'role', None) in ('INSTRUCTOR', 'ADMIN')
+    is_instructor = current_user is not None and current_user.role in (UserRole.INSTRUCTOR, UserRole.ADMIN)
     for q in quizzes:
         # Build quiz payload using questions -> options. Only include `is_correct` for instructors/admins.
         out.append({
@@ -150,28 +165,10 @@ async def get_quiz(
     quiz = result.scalar_one_or_none()
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
-    is_instructor = current_user and getattr(current_user, 'role', None) in ('INSTRUCTOR', 'ADMIN')
-    # Build plain payload
-    payload = {
-        'id': quiz.id,
-        'course_id': quiz.course_id,
-        'title': quiz.title,
-        'allow_retry': quiz.allow_retry,
-        'created_at': quiz.created_at,
-        'updated_at': getattr(quiz, 'updated_at', None),
-        'questions': []
-    }
-    for q in quiz.questions:
-        opts = []
-        for o in q.options:
-            opt = {'id': o.id, 'text': o.text}
-            if is_instructor:
-                opt['is_correct'] = o.is_correct
-            opts.append(opt)
-        payload['questions'].append({'id': q.id, 'text': q.text, 'order_index': q.order_index, 'options': opts})
-
-    # For non-instructors we might want to validate with QuizPublic, but returning a dict is fine
-    return payload
+    # Only instructors/admins see which options are correct
+    is_instructor = current_user is not None and current_user.role in (UserRole.INSTRUCTOR, UserRole.ADMIN)
+    adapter = serializers.quiz_detail if is_instructor else serializers.quiz_public
+    return serializers.json_response(adapter, quiz)
 
 
 @router.post("/quizzes/{quiz_id}/submit", response_model=QuizAttemptSchema)
@@ -266,7 +263,7 @@ async def submit_quiz(
 async def list_attempts(
     quiz_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_instructor_or_admin)],
+    current_user: Annotated[Principal, Depends(get_current_instructor_or_admin)],
 ):
     """List attempts for a quiz (instructor/admin only)."""
     # Eager-load answers for each attempt and return plain dicts to avoid ORM lazy-loading during serialization
@@ -293,7 +290,7 @@ async def list_attempts(
                 } for ans in a.answers
             ]
         })
-    return out
+    return serializers.json_response(serializers.quiz_attempt_list, out)
 
 
 @router.delete("/courses/{course_id}/quizzes/{quiz_id}", response_model=dict)
@@ -301,7 +298,7 @@ async def delete_course_quiz(
     course_id: int,
     quiz_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_instructor_or_admin)],
+    current_user: Annotated[Principal, Depends(get_current_instructor_or_admin)],
 ):
     """Delete a quiz belonging to a course. Instructors/Admins only."""
     # Ensure the quiz exists and belongs to the course
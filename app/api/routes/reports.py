@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_active_user, get_current_active_superuser
+from app.api.deps import get_read_db, get_current_active_user, get_current_active_superuser
 from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.lesson import Lesson
@@ -23,14 +23,14 @@ router = APIRouter()
 
 
 @router.get("/admin/reports/enrollments", response_model=List[CourseEnrollmentReportItem])
-async def course_enrollment_report(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def course_enrollment_report(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     q = select(Course.id, Course.title, func.count(Enrollment.id).label("enrollments")).join(Enrollment, Enrollment.course_id == Course.id, isouter=True).where(Course.is_published == True).group_by(Course.id)
     res = await db.execute(q)
     return [CourseEnrollmentReportItem(course_id=r.id, title=r.title, enrollments=int(r.enrollments or 0)) for r in res.fetchall()]
 
 
 @router.get("/admin/reports/completion", response_model=List[CompletionRateReportItem])
-async def completion_rate_report(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def completion_rate_report(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     # For each course: compute total lessons and completed lessons by all enrolled users as percentage
     total_lessons_sq = select(func.count(Lesson.id)).where(Lesson.course_id == Course.id).scalar_subquery()
     # Count distinct (user_id, lesson_id) completions by enrolled users only to avoid double-counting and exclude outsiders
@@ -65,7 +65,7 @@ async def completion_rate_report(db: AsyncSession = Depends(get_db), _=Depends(g
 
 
 @router.get("/admin/reports/dropoffs", response_model=List[DropoffReportItem])
-async def dropoff_points_report(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def dropoff_points_report(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     # Drop-off defined as lessons with the fewest completions relative to others in same course
     # Count distinct enrolled users who completed each lesson to avoid double-counting repeat logs
     # Only consider lessons that belong to an existing course (join Course)
@@ -112,7 +112,7 @@ async def dropoff_points_report(db: AsyncSession = Depends(get_db), _=Depends(ge
 
 
 @router.get("/admin/reports/average-time", response_model=List[AvgTimeReportItem])
-async def avg_time_report(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def avg_time_report(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     # Use Lesson.duration_seconds as proxy for time; compute weighted average per course (weighted by distinct completions per lesson)
     # First, fetch all lessons with their durations
     # Only include lessons for courses that still exist
@@ -158,7 +158,7 @@ async def avg_time_report(db: AsyncSession = Depends(get_db), _=Depends(get_curr
 
 
 @router.get("/admin/reports/quiz-performance", response_model=List[QuizPerformanceItem])
-async def quiz_performance_report(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def quiz_performance_report(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     # Safer approach: iterate quizzes and compute aggregates via scalar subqueries limited to valid attempts (total > 0)
     # Only include quizzes that belong to existing courses
     q = await db.execute(select(Quiz.id, Quiz.course_id, Quiz.title).join(Course, Course.id == Quiz.course_id).where(Course.is_published == True))
@@ -187,7 +187,7 @@ async def quiz_performance_report(db: AsyncSession = Depends(get_db), _=Depends(
 
 
 @router.get("/admin/reports/leaderboard", response_model=List[LeaderboardItem])
-async def admin_leaderboard(db: AsyncSession = Depends(get_db), _=Depends(get_current_active_superuser)):
+async def admin_leaderboard(db: AsyncSession = Depends(get_read_db), _=Depends(get_current_active_superuser)):
     # Reuse leaderboard logic: compute points by activity
     lesson_q = select(LessonCompletion.user_id, func.count(LessonCompletion.id).label("lessons")).group_by(LessonCompletion.user_id)
     lres = await db.execute(lesson_q)
@@ -1,10 +1,12 @@
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_read_db
 from app.api.role_checker import RoleChecker
+from app.core.cache import catalog_version, course_versions
 from app.db.base import get_db
 from app.models.user import User, UserRole
 from app.models.course import Course
@@ -15,20 +17,21 @@ from app.schemas.review import (
     ReviewCreate,
     ReviewUpdate
 )
+from app.schemas import serializers
 
 router = APIRouter()
 
 @router.get("/courses/{course_id}/reviews", response_model=List[ReviewSchema])
 async def list_course_reviews(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     course_id: int
-) -> List[Review]:
+) -> Response:
     result = await db.execute(
         select(Review)
         .where(Review.course_id == course_id)
         .order_by(Review.created_at.desc())
     )
-    return result.scalars().all()
+    return serializers.json_response(serializers.review_list, result.scalars().all())
 
 @router.post("/courses/{course_id}/reviews", response_model=ReviewSchema)
 async def create_review(
@@ -73,9 +76,17 @@ async def create_review(
         course_id=course_id
     )
     db.add(db_review)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Lost a race with a concurrent review by the same user
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Already reviewed this course"
+        )
     
     # Update course average rating
-    await db.flush()
     result = await db.execute(
         select(func.avg(Review.rating))
         .where(Review.course_id == course_id)
@@ -87,6 +98,8 @@ async def create_review(
     course.average_rating = round(float(avg_rating), 2)
     
     await db.commit()
+    catalog_version.bump()  # average_rating changed
+    course_versions.bump(course_id)
     await db.refresh(db_review)
     return db_review
 
@@ -122,6 +135,8 @@ async def update_review(
     course.average_rating = round(float(avg_rating), 2)
     
     await db.commit()
+    catalog_version.bump()
+    course_versions.bump(review.course_id)
     await db.refresh(review)
     return review
 
@@ -155,4 +170,6 @@ async def delete_review(
     course.average_rating = round(float(avg_rating or 0), 2)
     
     await db.commit()
+    catalog_version.bump()
+    course_versions.bump(course_id)
     return {"ok": True}
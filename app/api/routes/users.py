@@ -1,11 +1,17 @@
 from typing import Annotated, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 from sqlalchemy.exc import IntegrityError
 from app.api.deps import get_db, get_current_active_user
+from app.core.cache import course_access_versions, course_versions, enrollment_version, principal_cache
+from app.core.security import password_service
+from app.core.token_versions import token_versions
+from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.lesson_completion import LessonCompletion
+from app.models.token_revocation import TokenRevocation
+from app.models.user_session import UserSession
 from app.api.role_checker import RoleChecker
 from app.models.user import User, UserRole
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
@@ -47,8 +53,6 @@ async def create_user(
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="A user with this email already exists.")
 
-    from app.core.security import get_password_hash
-
     # Normalize role input (accept enum or string like 'STUDENT'/'student')
     try:
         if user_in.role is None:
@@ -60,10 +64,11 @@ async def create_user(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid role value: {user_in.role}")
 
+    hashed_password = await password_service.hash(user_in.password)
     db_user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         role=role
     )
 
@@ -71,6 +76,7 @@ async def create_user(
     try:
         await db.commit()
         await db.refresh(db_user)
+        token_versions.update(db_user.id, db_user.token_version, db_user.role)
         return db_user
     except IntegrityError as ie:
         await db.rollback()
@@ -96,8 +102,7 @@ async def update_user(
 
     # Handle password update separately
     if "password" in update_data and update_data.get("password"):
-        from app.core.security import get_password_hash
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await password_service.hash(update_data.pop("password"))
 
     # Handle role update (accept enum or string)
     if "role" in update_data:
@@ -116,12 +121,26 @@ async def update_user(
         if existing.scalar_one_or_none():
             raise HTTPException(status_code=400, detail="A user with this email already exists.")
 
+    # Role and password changes revoke every access token issued so far
+    if ("role" in update_data and update_data["role"] != user.role) or "hashed_password" in update_data:
+        update_data["token_version"] = user.token_version + 1
+
     try:
         for field, value in update_data.items():
             setattr(user, field, value)
+        if "token_version" in update_data:
+            # Refresh tokens would otherwise mint access tokens at the new version
+            await db.execute(delete(UserSession).where(UserSession.user_id == user_id))
+            # Tells the other workers to drop their cached token version
+            db.add(TokenRevocation(user_id=user_id))
 
         await db.commit()
+        principal_cache.invalidate(user_id)
+        if "full_name" in update_data or "email" in update_data:
+            # Instructor names are part of every cached course outline
+            course_versions.bump_all()
         await db.refresh(user)
+        token_versions.update(user.id, user.token_version, user.role)
         return user
     except IntegrityError:
         await db.rollback()
@@ -147,15 +166,29 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     try:
-        # Delete all enrollments first
+        # Delete all enrollments first, keeping the courses' counters in step
+        await db.execute(
+            update(Course)
+            .where(Course.id.in_(select(Enrollment.course_id).where(Enrollment.user_id == user_id)))
+            .values(enrollment_count=Course.enrollment_count - 1, updated_at=Course.updated_at)
+            .execution_options(synchronize_session=False)
+        )
         await db.execute(delete(Enrollment).where(Enrollment.user_id == user_id))
 
         # Delete lesson completions belonging to the user to avoid FK nullification
         await db.execute(delete(LessonCompletion).where(LessonCompletion.user_id == user_id))
 
+        # Revoke refresh tokens
+        await db.execute(delete(UserSession).where(UserSession.user_id == user_id))
+
         # Now delete the user
         await db.delete(user)
+        db.add(TokenRevocation(user_id=user_id))
         await db.commit()
+        principal_cache.invalidate(user_id)
+        token_versions.discard(user_id)
+        enrollment_version.bump()  # enrollment counts changed
+        course_access_versions.bump(user_id)
 
         return {"ok": True}
     except Exception as e:
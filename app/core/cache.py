@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Bounded in-process cache with least-recently-used eviction and a per-entry TTL.
+
+    The app runs on a single event loop per worker, so no locking is needed.
+    Hit/miss counters are kept so the cache's effect can be checked at runtime.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class VersionCounter:
+    """In-process version number, bumped by writes that change what a cache serves.
+
+    Caches include the version in their keys, so a bump makes every older entry
+    unreachable at once (they age out through LRU). Other worker processes do
+    not see the bump; their entries expire through the cache TTL instead.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self) -> None:
+        self.value += 1
+
+
+class KeyedVersions:
+    """A VersionCounter per key (e.g. per course), plus an epoch that bumps them all."""
+
+    def __init__(self):
+        self._versions: dict = {}
+        self._epoch = 0
+
+    def get(self, key: Hashable) -> tuple[int, int]:
+        return self._epoch, self._versions.get(key, 0)
+
+    def bump(self, key: Hashable) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def bump_all(self) -> None:
+        self._epoch += 1
+
+
+# Authenticated users keyed by user id. Entries are detached ORM instances and
+# must be invalidated whenever the underlying user row changes.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Serialized GET /courses pages keyed by (catalog_version, normalized query);
+# entries are (body, etag, next_cursor, gzipped body or None).
+# Bump catalog_version after any committed write that changes published
+# course rows or their order.
+catalog_version = VersionCounter()
+# Enrollment writes only change enrollment_count, which cached catalog pages
+# pick up through their TTL; they bump this instead, which only the in-memory
+# catalog snapshot (app.core.catalog_snapshot) watches.
+enrollment_version = VersionCounter()
+catalog_cache = TTLCache(
+    maxsize=settings.CATALOG_CACHE_MAX_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+
+# Public part of GET /courses/{id} keyed by (course_id, course_versions.get(course_id)).
+# Bump the course's version after any committed write to the course, its
+# lessons or its reviews; bump_all when instructor names change.
+course_versions = KeyedVersions()
+course_outline_cache = TTLCache(
+    maxsize=settings.COURSE_OUTLINE_CACHE_MAX_SIZE,
+    ttl=settings.COURSE_OUTLINE_CACHE_TTL_SECONDS,
+)
+
+# Positive enrollment checks for lesson gating, keyed by (user_id, course_id,
+# course_access_versions.get(user_id)). Only True is ever stored, so enrolling
+# on any worker takes effect immediately; bump the user's version when their
+# enrollments are removed (user deletion).
+course_access_versions = KeyedVersions()
+course_access_cache = TTLCache(
+    maxsize=settings.COURSE_ACCESS_CACHE_MAX_SIZE,
+    ttl=settings.COURSE_ACCESS_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.cache import catalog_version, enrollment_version
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.db.base import async_primary_read_session
+from app.models.course import Course
+
+# order_by -> CourseRecord attribute; every ordering is (key DESC, id DESC),
+# the same as the SQL path in routes.courses
+SORT_KEYS = {"newest": "created_at", "rating": "average_rating", "popularity": "enrollment_count"}
+
+
+class CourseRecord:
+    """Detached, read-only copy of the Course columns the catalog serves."""
+
+    __slots__ = (
+        "id", "instructor_id", "title", "subtitle", "description", "category", "language",
+        "level", "price", "thumbnail_url", "promo_video_url", "is_published", "created_at",
+        "updated_at", "average_rating", "enrollment_count",
+    )
+
+    def __init__(self, course: Course):
+        for name in self.__slots__:
+            setattr(self, name, getattr(course, name))
+
+
+class CatalogSnapshot:
+    """Immutable view of the published catalog with precomputed orderings.
+
+    `orders[order_by]` is a permutation of record positions in sort order and
+    `ranks[order_by][pos]` the position's place in it. Category and level have
+    position sets per value, so a filtered page only visits matching records.
+    """
+
+    __slots__ = ("version", "built_at", "records", "orders", "ranks", "sort_keys", "by_category", "by_level")
+
+    def __init__(self, courses: List[Course], version: Tuple[int, int]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.records = [CourseRecord(course) for course in courses]
+        self.orders = {}
+        self.ranks = {}
+        self.sort_keys = {}
+        for order_by, attr in SORT_KEYS.items():
+            order = sorted(
+                range(len(self.records)),
+                key=lambda pos: (getattr(self.records[pos], attr), self.records[pos].id),
+                reverse=True,
+            )
+            rank = [0] * len(order)
+            for place, pos in enumerate(order):
+                rank[pos] = place
+            self.orders[order_by] = order
+            self.ranks[order_by] = rank
+            self.sort_keys[order_by] = [(getattr(self.records[pos], attr), self.records[pos].id) for pos in order]
+        self.by_category: dict = {}
+        self.by_level: dict = {}
+        for pos, record in enumerate(self.records):
+            self.by_category.setdefault(record.category, set()).add(pos)
+            self.by_level.setdefault(record.level, set()).add(pos)
+
+    def page(
+        self,
+        order_by: str,
+        skip: int,
+        limit: int,
+        category: Optional[str],
+        level: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        after: Optional[tuple],
+    ) -> Tuple[List[CourseRecord], Optional[str]]:
+        order = self.orders[order_by]
+        rank = self.ranks[order_by]
+
+        start = 0
+        if after is not None:
+            # First place whose (key, id) sorts strictly after the cursor
+            keys = self.sort_keys[order_by]
+            start = bisect_left(range(len(keys)), True, key=lambda place: keys[place] < after)
+
+        candidates = None
+        for index, value in ((self.by_category, category), (self.by_level, level)):
+            if value:
+                matches = index.get(value, set())
+                candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            positions = order[start:]
+        else:
+            positions = sorted((pos for pos in candidates if rank[pos] >= start), key=rank.__getitem__)
+
+        page = []
+        to_skip = 0 if after is not None else skip
+        for pos in positions:
+            record = self.records[pos]
+            # Same semantics as the SQL filters: no price never matches a price bound
+            if min_price is not None and (record.price is None or record.price < min_price):
+                continue
+            if max_price is not None and (record.price is None or record.price > max_price):
+                continue
+            if to_skip:
+                to_skip -= 1
+                continue
+            page.append(record)
+            if len(page) > limit:
+                break
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            next_cursor = encode_cursor(order_by, getattr(last, SORT_KEYS[order_by]), last.id)
+        return page, next_cursor
+
+
+class CatalogSnapshotEngine:
+    """Serves catalog list queries from a CatalogSnapshot instead of SQL.
+
+    The snapshot is rebuilt (one query) when catalog_version or
+    enrollment_version has moved since it was built, or after `max_age`
+    seconds so other workers' writes show up.
+    Search and relevance ordering are not handled here; callers use SQL.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock: asyncio.Lock | None = None
+
+    def _stale(self) -> bool:
+        snapshot = self._snapshot
+        return (
+            snapshot is None
+            or snapshot.version != (catalog_version.value, enrollment_version.value)
+            or time.monotonic() - snapshot.built_at >= self.max_age
+        )
+
+    async def _rebuild(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._stale():
+                return
+            version = (catalog_version.value, enrollment_version.value)
+            # Rebuilt right after catalog writes, so a lagging replica would miss them
+            async with async_primary_read_session() as session:
+                result = await session.execute(select(Course).where(Course.is_published == True))
+                courses = result.scalars().all()
+            self._snapshot = CatalogSnapshot(courses, version)
+
+    async def page(
+        self,
+        order_by: str,
+        skip: int,
+        limit: int,
+        category: Optional[str],
+        level: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        after: Optional[tuple],
+    ) -> Tuple[List[CourseRecord], Optional[str]]:
+        if self._stale():
+            await self._rebuild()
+        return self._snapshot.page(order_by, skip, limit, category, level, min_price, max_price, after)
+
+
+catalog_snapshot = (
+    CatalogSnapshotEngine(max_age=settings.CATALOG_CACHE_TTL_SECONDS) if settings.CATALOG_SNAPSHOT else None
+)
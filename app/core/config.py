@@ -1,7 +1,17 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, EmailStr, validator
 
+def _to_async_url(url: str) -> str:
+    # Check if sqlite
+    if url.startswith('sqlite:///'):
+        return url.replace('sqlite:///', 'sqlite+aiosqlite:///')
+    # Check if postgresql
+    elif url.startswith('postgresql://'):
+        return url.replace('postgresql://', 'postgresql+asyncpg://')
+    # Return as is for other cases
+    return url
+
 class Settings(BaseSettings):
     ENVIRONMENT: str
     DEBUG: bool = False
@@ -9,17 +19,35 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Optional read replica used by read-only routes. A SQLite copy of the
+    # primary works as a stand-in for local testing.
+    READ_DATABASE_URL: Optional[str] = None
+    # After a user writes, their reads go to the primary for this long so they
+    # are not served stale data by a lagging replica
+    READ_YOUR_WRITES_SECONDS: int = 10
+
+    # Report per-request DB usage in X-DB-* response headers and debug logs
+    DB_REQUEST_STATS: bool = True
+    # Flag a statement as a likely N+1 once it runs this many times in one request (0 disables)
+    DB_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Opt-in slow-query recorder, readable at /admin/diagnostics/slow-queries
+    SLOW_QUERY_LOG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 100  # most recent entries kept
+    SLOW_QUERY_EXPLAIN: bool = True  # capture the query plan of slow SELECTs
+    
     @property
     def async_database_url(self) -> str:
         """Get the async database URL from the sync URL."""
-        # Check if sqlite
-        if self.DATABASE_URL.startswith('sqlite:///'):
-            return self.DATABASE_URL.replace('sqlite:///', 'sqlite+aiosqlite:///')
-        # Check if postgresql
-        elif self.DATABASE_URL.startswith('postgresql://'):
-            return self.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
-        # Return as is for other cases
-        return self.DATABASE_URL
+        return _to_async_url(self.DATABASE_URL)
+
+    @property
+    def async_read_database_url(self) -> Optional[str]:
+        """Get the async read replica URL, if one is configured."""
+        if not self.READ_DATABASE_URL:
+            return None
+        return _to_async_url(self.READ_DATABASE_URL)
     
     @property
     def sync_database_url(self) -> str:
@@ -29,11 +57,67 @@ class Settings(BaseSettings):
         elif self.DATABASE_URL.startswith('sqlite+aiosqlite:///'):
             return self.DATABASE_URL.replace('sqlite+aiosqlite:///', 'sqlite:///')
         return self.DATABASE_URL
+
+    # Connection pool (ignored for in-memory SQLite, which uses a single static connection)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_RECYCLE: int = -1  # seconds; -1 disables recycling
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes
+    SQLITE_CACHE_SIZE: int = -64000  # negative values are KiB, positive are pages
+
+    # SQLite single-writer mode: all writes go through one dedicated connection
+    # (waiters queue for it), reads use a pool of read-only WAL connections
+    SQLITE_SINGLE_WRITER: bool = False
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_WRITER_QUEUE_TIMEOUT: float = 30.0  # seconds to wait for the writer
     
     # Security
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # Authenticated user cache (avoids loading User on every request)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Serialized public catalog pages (GET /courses), keyed by catalog version
+    CATALOG_CACHE_TTL_SECONDS: int = 30
+    CATALOG_CACHE_MAX_SIZE: int = 512
+    # Serve unsearched catalog pages from an in-process snapshot instead of SQL
+    CATALOG_SNAPSHOT: bool = False
+    # Public course detail (course, instructor name, lesson outline), keyed by course version
+    # Version bumps are per process, so the TTL bounds staleness on other workers
+    COURSE_OUTLINE_CACHE_TTL_SECONDS: int = 30
+    COURSE_OUTLINE_CACHE_MAX_SIZE: int = 2000
+    # Positive (user, course) enrollment checks used for lesson gating
+    COURSE_ACCESS_CACHE_TTL_SECONDS: int = 300
+    COURSE_ACCESS_CACHE_MAX_SIZE: int = 10000
+
+    # gzip JSON/text responses of at least COMPRESSION_MINIMUM_SIZE bytes for
+    # clients that accept it; cached bodies are stored precompressed
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6  # 1 (fastest) to 9 (smallest)
+
+    # How often the in-memory catalog facet index is rebuilt from the database
+    FACET_INDEX_RELOAD_SECONDS: int = 60
+
+    # Password hashing runs on a dedicated thread pool with bounded admission
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0
+
+    # How often each worker polls the tokenrevocation log. A role change,
+    # password change or deletion made by another worker process is enforced
+    # here at most this many seconds later (immediately on the same worker).
+    TOKEN_REVOCATION_POLL_SECONDS: float = 1.0
+
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:3000", "http://127.0.0.1:3000"]
     
@@ -0,0 +1,82 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import false, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import course_access_cache, course_access_versions
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.user import User, UserRole
+
+
+class CourseAccess(NamedTuple):
+    """What gating a course's lessons needs to know about one caller.
+
+    The caller's role is checked against the live user, so role changes take
+    effect immediately.
+    """
+
+    instructor_id: int
+    is_published: bool
+    is_enrolled: bool
+
+    def is_staff(self, user: Optional[User]) -> bool:
+        return user is not None and (user.id == self.instructor_id or user.role == UserRole.ADMIN)
+
+    def can_view_course(self, user: Optional[User]) -> bool:
+        return self.is_published or self.is_staff(user)
+
+    def can_view_all_lessons(self, user: Optional[User]) -> bool:
+        """False means only preview lessons are visible."""
+        return self.is_enrolled or self.is_staff(user)
+
+
+# Only positive enrollment checks are cached. A negative answer can turn
+# positive on any worker at any time (the user enrolls), so it is always
+# re-checked; a positive one only goes away when the user is deleted.
+def _enrollment_key(user_id: int, course_id: int) -> tuple:
+    return user_id, course_id, course_access_versions.get(user_id)
+
+
+async def is_enrolled(db: AsyncSession, course_id: int, user_id: int) -> bool:
+    key = _enrollment_key(user_id, course_id)
+    if course_access_cache.get(key):
+        return True
+    result = await db.execute(
+        select(Enrollment.id)
+        .where(Enrollment.course_id == course_id, Enrollment.user_id == user_id)
+        .limit(1)
+    )
+    enrolled = result.scalar_one_or_none() is not None
+    if enrolled:
+        course_access_cache.set(key, True)
+    return enrolled
+
+
+async def get_course_access(db: AsyncSession, course_id: int, user: Optional[User]) -> Optional[CourseAccess]:
+    """Access facts for `user` (None when anonymous) on a course, or None if it does not exist.
+
+    The course row is always read (a primary-key lookup), so ownership and
+    publish changes made on any worker apply at once; the enrollment EXISTS
+    is folded into the same query unless a positive answer is cached.
+    """
+    if user is None:
+        enrolled = false()
+    elif course_access_cache.get(_enrollment_key(user.id, course_id)):
+        enrolled = true()
+    else:
+        enrolled = (
+            select(Enrollment.id)
+            .where(Enrollment.course_id == Course.id, Enrollment.user_id == user.id)
+            .exists()
+        )
+    result = await db.execute(
+        select(Course.instructor_id, Course.is_published, enrolled.label("is_enrolled"))
+        .where(Course.id == course_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    if user is not None and row.is_enrolled:
+        course_access_cache.set(_enrollment_key(user.id, course_id), True)
+    return CourseAccess(row.instructor_id, bool(row.is_published), bool(row.is_enrolled))
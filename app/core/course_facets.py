@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import Counter
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.base import async_read_session
+from app.models.course import Course
+
+# (key, lower bound inclusive, upper bound exclusive); None means unbounded.
+# "free" covers both price 0 and no price.
+PRICE_BUCKETS = [
+    ("free", None, None),
+    ("0-25", 0, 25),
+    ("25-50", 25, 50),
+    ("50-100", 50, 100),
+    ("100+", 100, None),
+]
+
+
+class FacetEntry(NamedTuple):
+    category: str
+    level: str
+    price: Optional[float]
+    price_bucket: str
+
+
+def price_bucket(price: Optional[float]) -> str:
+    if not price:
+        return "free"
+    for key, low, high in PRICE_BUCKETS[1:]:
+        if price >= low and (high is None or price < high):
+            return key
+    return "100+"
+
+
+def _entry(category: str, level, price) -> FacetEntry:
+    price = float(price) if price is not None else None
+    level = level.value if hasattr(level, "value") else level
+    return FacetEntry(category, level, price, price_bucket(price))
+
+
+class CourseFacetIndex:
+    """In-memory facet counts (category, level, price bucket) over published courses.
+
+    Unfiltered counts are maintained incrementally as courses are written by
+    this process; filtered counts are computed by scanning the in-memory
+    entries, never by querying the database. Like the token version table, the
+    index is reloaded in full periodically to pick up other workers' writes.
+    """
+
+    def __init__(self, reload_interval: float):
+        self.reload_interval = reload_interval
+        self._entries: dict[int, FacetEntry] = {}
+        self._totals = {"category": Counter(), "level": Counter(), "price": Counter()}
+        self._loaded_at: float | None = None
+        self._lock: asyncio.Lock | None = None
+
+    def _reload_due(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_interval
+
+    async def _reload(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._reload_due():
+                return
+            async with async_read_session() as session:
+                result = await session.execute(
+                    select(Course.id, Course.category, Course.level, Course.price)
+                    .where(Course.is_published == True)
+                )
+                entries = {row.id: _entry(row.category, row.level, row.price) for row in result}
+            self._entries = {}
+            self._totals = {"category": Counter(), "level": Counter(), "price": Counter()}
+            for course_id, entry in entries.items():
+                self._add(course_id, entry)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, course_id: int, entry: FacetEntry) -> None:
+        self._entries[course_id] = entry
+        self._totals["category"][entry.category] += 1
+        self._totals["level"][entry.level] += 1
+        self._totals["price"][entry.price_bucket] += 1
+
+    def discard(self, course_id: int) -> None:
+        entry = self._entries.pop(course_id, None)
+        if entry is None:
+            return
+        for facet, value in (("category", entry.category), ("level", entry.level), ("price", entry.price_bucket)):
+            self._totals[facet][value] -= 1
+            if self._totals[facet][value] <= 0:
+                del self._totals[facet][value]
+
+    def upsert(self, course: Course) -> None:
+        """Apply a committed create/update of `course`."""
+        self.discard(course.id)
+        if course.is_published:
+            self._add(course.id, _entry(course.category, course.level, course.price))
+
+    async def counts(
+        self,
+        category: Optional[str] = None,
+        level: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> dict:
+        """Counts per facet value for courses matching the filters.
+
+        Each facet is counted with every filter applied except its own, so the
+        client can show how many results selecting another value would give.
+        """
+        if self._reload_due():
+            await self._reload()
+
+        if category is None and level is None and min_price is None and max_price is None:
+            totals = self._totals
+            total = len(self._entries)
+        else:
+            totals = {"category": Counter(), "level": Counter(), "price": Counter()}
+            total = 0
+            for entry in self._entries.values():
+                # Same semantics as the SQL filters: no price never matches a price bound
+                in_price = (min_price is None or (entry.price is not None and entry.price >= min_price)) and (
+                    max_price is None or (entry.price is not None and entry.price <= max_price)
+                )
+                in_category = category is None or entry.category == category
+                in_level = level is None or entry.level == level
+                if in_level and in_price:
+                    totals["category"][entry.category] += 1
+                if in_category and in_price:
+                    totals["level"][entry.level] += 1
+                if in_category and in_level:
+                    totals["price"][entry.price_bucket] += 1
+                if in_category and in_level and in_price:
+                    total += 1
+
+        return {
+            "total": total,
+            "category": [
+                {"value": value, "count": count}
+                for value, count in sorted(totals["category"].items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "level": [
+                {"value": value, "count": count}
+                for value, count in sorted(totals["level"].items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "price": [
+                {"value": key, "min": low, "max": high, "count": totals["price"].get(key, 0)}
+                for key, low, high in PRICE_BUCKETS
+            ],
+        }
+
+
+course_facets = CourseFacetIndex(reload_interval=settings.FACET_INDEX_RELOAD_SECONDS)
@@ -0,0 +1,35 @@
+"""Sparse integer keys for Lesson.order_index.
+
+Lessons are spaced GAP apart, so placing one between two neighbours takes
+the midpoint of their keys and writes a single row. Appends take the next
+key from Course.lesson_order_tail. When two neighbours end up adjacent the
+course is rebalanced back to even spacing.
+"""
+from typing import List, Optional
+
+GAP = 1024
+# Rebalance in the background once a placement leaves less room than this
+LOW_WATER = 16
+
+
+def key_between(before: Optional[int], after: Optional[int]) -> Optional[int]:
+    """A key strictly between two neighbour keys, or None when they are adjacent.
+
+    `before` is None for the first position; `after` None for the last.
+    """
+    low = before if before is not None else 0
+    if after is None:
+        return low + GAP
+    if after - low < 2:
+        return None
+    return low + (after - low) // 2
+
+
+def needs_rebalance(before: Optional[int], key: int, after: Optional[int]) -> bool:
+    low = before if before is not None else 0
+    return key - low < LOW_WATER or (after is not None and after - key < LOW_WATER)
+
+
+def spaced_keys(count: int) -> List[int]:
+    """Evenly spaced keys for `count` lessons: GAP, 2*GAP, ..."""
+    return [GAP * (i + 1) for i in range(count)]
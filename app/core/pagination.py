@@ -0,0 +1,48 @@
+"""Opaque cursor tokens for keyset pagination.
+
+A cursor carries the sort order it was issued for and the sort key values of
+the last row on the page (ending with its id), so the next page can be read
+with ``WHERE (key, id) < (:key, :id)`` from an index instead of an OFFSET scan.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(order: str, *values: Any) -> str:
+    payload = json.dumps({"o": order, "k": [_to_json(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, order: str, types: Sequence[type]) -> tuple:
+    """Decode `token` and coerce its values to `types`.
+
+    Raises InvalidCursor if the token is malformed or was issued for another
+    sort order.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = payload["k"]
+        if payload["o"] != order or len(values) != len(types):
+            raise InvalidCursor("Cursor does not match this sort order")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -8,7 +12,12 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    role: str | None = None,
+    token_version: int | None = None,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -16,11 +25,76 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    # Role and version claims let authorization checks skip loading the user
+    if role is not None:
+        to_encode["role"] = role
+    if token_version is not None:
+        to_encode["ver"] = token_version
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token() -> tuple[str, str]:
+    """Return a new opaque refresh token and the hash to persist for it."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    # Refresh tokens are high-entropy random strings, so a fast digest is
+    # sufficient and keeps renewal a single indexed lookup (no bcrypt).
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when the password service cannot admit more work within its queue timeout."""
+
+
+class PasswordService:
+    """Runs bcrypt hashing/verification on a dedicated thread pool.
+
+    bcrypt is deliberately slow; calling it inline in an async handler stalls
+    the whole event loop. Work is admitted through a semaphore so that a login
+    spike queues for at most `queue_timeout` seconds before being rejected.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: int, queue_timeout: float):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._max_concurrency = max_concurrency
+        self._queue_timeout = queue_timeout
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _admission(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        semaphore = self._admission()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self._queue_timeout)
+        except asyncio.TimeoutError:
+            raise PasswordServiceBusy()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            semaphore.release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+
+password_service = PasswordService(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
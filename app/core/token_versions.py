@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.base import async_primary_read_session
+from app.models.token_revocation import TokenRevocation
+from app.models.user import User, UserRole
+
+# Revocation ids are handed out before their transaction commits, so a row can
+# become visible after a higher id already was. Re-reading this many ids below
+# the newest one seen catches those late commits.
+_REVOCATION_OVERLAP = 100
+
+
+class TokenVersionTable:
+    """In-memory map of user id -> (token_version, role) used to validate access tokens.
+
+    Access tokens carry the user's role and token version as signed claims, so an
+    authorization check only has to confirm the claims are still current.
+    Entries are fetched the first time a user is seen and kept until the user's
+    tokens are revoked. Changes made by this process update the table in place;
+    changes made by other workers are picked up from the tokenrevocation log,
+    which is polled (one indexed range query) at most every `poll_interval`
+    seconds and only drops the entries of the users it names.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._entries: dict[int, tuple[int, UserRole]] = {}
+        self._last_revocation_id: int | None = None
+        self._seen_revocations: set[int] = set()
+        self._polled_at: float | None = None
+        self._lock: asyncio.Lock | None = None
+
+    def _poll_due(self) -> bool:
+        return self._polled_at is None or time.monotonic() - self._polled_at >= self.poll_interval
+
+    async def _poll(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._poll_due():
+                return
+            async with async_primary_read_session() as session:
+                if self._last_revocation_id is None:
+                    # Nothing is cached yet, so only the starting point matters
+                    newest = await session.scalar(select(func.max(TokenRevocation.id)))
+                    self._last_revocation_id = newest or 0
+                else:
+                    result = await session.execute(
+                        select(TokenRevocation.id, TokenRevocation.user_id)
+                        .where(TokenRevocation.id > self._last_revocation_id - _REVOCATION_OVERLAP)
+                    )
+                    for row in result:
+                        if row.id in self._seen_revocations:
+                            continue
+                        self._seen_revocations.add(row.id)
+                        self._entries.pop(row.user_id, None)
+                        self._last_revocation_id = max(self._last_revocation_id, row.id)
+                    floor = self._last_revocation_id - _REVOCATION_OVERLAP
+                    self._seen_revocations = {rid for rid in self._seen_revocations if rid > floor}
+            self._polled_at = time.monotonic()
+
+    async def lookup(self, user_id: int) -> tuple[int, UserRole] | None:
+        """Return (token_version, role) for the user, or None if the user does not exist."""
+        if self._poll_due():
+            await self._poll()
+        entry = self._entries.get(user_id)
+        if entry is None:
+            async with async_primary_read_session() as session:
+                result = await session.execute(
+                    select(User.token_version, User.role).where(User.id == user_id)
+                )
+                row = result.one_or_none()
+            if row is None:
+                return None
+            entry = (row.token_version, row.role)
+            self._entries[user_id] = entry
+        return entry
+
+    def update(self, user_id: int, token_version: int, role: UserRole) -> None:
+        self._entries[user_id] = (token_version, role)
+
+    def discard(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+
+token_versions = TokenVersionTable(poll_interval=settings.TOKEN_REVOCATION_POLL_SECONDS)
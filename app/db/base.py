@@ -1,15 +1,137 @@
-from sqlalchemy.orm import DeclarativeBase, declared_attr
+from sqlalchemy import event, text
+from sqlalchemy.orm import DeclarativeBase, Session, declared_attr
+from sqlalchemy.sql.selectable import CompoundSelect, Select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.slow_queries import slow_query_log
 
-# Create async engine
-engine = create_async_engine(
-    settings.async_database_url,
-    echo=settings.DEBUG,
-    # Required for SQLite
-    connect_args={"check_same_thread": False} if settings.async_database_url.startswith('sqlite') else {}
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith('sqlite')
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (':memory:' in url or url.rstrip('/').endswith(':'))
+
+
+def _engine_options(url: str) -> dict:
+    options = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if _is_sqlite(url):
+        # Required for SQLite
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_sqlite_memory(url):
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets readers proceed while a writer is active; the remaining pragmas
+    # trade a little durability on power loss for far fewer fsyncs.
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.close()
+
+
+def _make_read_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+_single_writer = (
+    settings.SQLITE_SINGLE_WRITER
+    and _is_sqlite(settings.async_database_url)
+    and not _is_sqlite_memory(settings.async_database_url)
 )
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# Create async engine
+engine_options = _engine_options(settings.async_database_url)
+if _single_writer:
+    # One writer connection; AsyncAdaptedQueuePool queues concurrent writers on it
+    engine_options.update(pool_size=1, max_overflow=0, pool_timeout=settings.SQLITE_WRITER_QUEUE_TIMEOUT)
+engine = create_async_engine(settings.async_database_url, **engine_options)
+if _is_sqlite(settings.async_database_url):
+    event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+sqlite_read_engine = None
+if _single_writer:
+    read_options = _engine_options(settings.async_database_url)
+    read_options["pool_size"] = settings.SQLITE_READ_POOL_SIZE
+    sqlite_read_engine = create_async_engine(settings.async_database_url, **read_options)
+    event.listen(sqlite_read_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(sqlite_read_engine.sync_engine, "connect", _make_read_only)
+
+
+class SQLiteRoutingSession(Session):
+    """Routes plain SELECTs to the read-only pool and everything else to the writer.
+
+    Once a transaction has written it stays pinned to the writer until it ends,
+    so later reads in the same transaction see its own uncommitted changes.
+    A call without a clause (e.g. ``get_bind()`` to look up the dialect) is
+    treated as a read and pins nothing.
+    """
+
+    _pinned_to_writer = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if clause is None and not (self._pinned_to_writer or self._flushing):
+            return sqlite_read_engine.sync_engine
+        if self._pinned_to_writer or self._flushing or not isinstance(clause, (Select, CompoundSelect)):
+            self._pinned_to_writer = True
+            return engine.sync_engine
+        return sqlite_read_engine.sync_engine
+
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _unpin_writer(session, transaction) -> None:
+    if transaction.parent is None:
+        session._pinned_to_writer = False
+
+
+def _read_only_sessionmaker(bind_engine) -> async_sessionmaker:
+    # AUTOCOMMIT: SELECT-only requests skip the BEGIN/COMMIT round trips
+    return async_sessionmaker(
+        bind_engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+if _single_writer:
+    async_session = async_sessionmaker(class_=AsyncSession, sync_session_class=SQLiteRoutingSession, expire_on_commit=False)
+    # Same database file as the writer, opened read-only, so these sessions
+    # can never write or queue behind the single writer connection
+    async_primary_read_session = _read_only_sessionmaker(sqlite_read_engine)
+else:
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async_primary_read_session = _read_only_sessionmaker(engine)
+
+# Optional read replica for read-only routes (see app.api.deps.get_read_db)
+read_engine = None
+async_read_session = async_primary_read_session
+if settings.async_read_database_url:
+    read_url = settings.async_read_database_url
+    read_engine = create_async_engine(read_url, **_engine_options(read_url))
+    if _is_sqlite(read_url):
+        event.listen(read_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        event.listen(read_engine.sync_engine, "connect", _make_read_only)
+    async_read_session = _read_only_sessionmaker(read_engine)
+
+for _engine in (engine, sqlite_read_engine, read_engine):
+    if _engine is not None:
+        instrument_engine(_engine)
+        if settings.SLOW_QUERY_LOG:
+            slow_query_log.attach(_engine)
 
 class Base(DeclarativeBase):
     id: int
@@ -22,13 +144,80 @@ class Base(DeclarativeBase):
     def dict(self):
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
 
+# session.info flag set once a transaction has written, so get_db only commits when needed
+HAS_WRITES = "has_writes"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session, flush_context) -> None:
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_writes(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(HAS_WRITES, None)
+
+
+def _needs_commit(session: AsyncSession) -> bool:
+    return bool(session.new or session.dirty or session.deleted or session.info.get(HAS_WRITES))
+
+
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         try:
             yield session
-            await session.commit()
+            # Handlers usually commit themselves; skip the extra round trip
+            # when nothing is left to write.
+            if _needs_commit(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+SQLITE_DIAGNOSTIC_PRAGMAS = ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size")
+
+
+def _pool_info(pool) -> dict:
+    return {
+        "class": type(pool).__name__,
+        "status": pool.status(),
+        "size": getattr(pool, "size", lambda: None)(),
+        "max_overflow": getattr(pool, "_max_overflow", None),
+        "pre_ping": pool._pre_ping,
+        "recycle": pool._recycle,
+    }
+
+
+async def database_diagnostics(session: AsyncSession) -> dict:
+    """Report the configured pool options and the settings actually in effect on a live connection."""
+    info = {
+        "dialect": engine.dialect.name,
+        "driver": engine.dialect.driver,
+        "sqlite_single_writer": _single_writer,
+        "pool": _pool_info(engine.pool),
+    }
+    if sqlite_read_engine is not None:
+        info["read_pool"] = _pool_info(sqlite_read_engine.pool)
+    if read_engine is not None:
+        info["read_replica"] = {
+            "dialect": read_engine.dialect.name,
+            "pool": _pool_info(read_engine.pool),
+            "read_your_writes_seconds": settings.READ_YOUR_WRITES_SECONDS,
+        }
+    if engine.dialect.name == "sqlite":
+        pragmas = {}
+        for name in SQLITE_DIAGNOSTIC_PRAGMAS:
+            result = await session.execute(text(f"PRAGMA {name}"))
+            pragmas[name] = result.scalar()
+        info["sqlite_pragmas"] = pragmas
+    return info
@@ -8,3 +8,5 @@ from app.models.lesson import Lesson  # noqa: F401
 from app.models.enrollment import Enrollment  # noqa: F401
 from app.models.lesson_completion import LessonCompletion  # noqa: F401
 from app.models.review import Review  # noqa: F401
+from app.models.user_session import UserSession  # noqa: F401
+from app.models.token_revocation import TokenRevocation  # noqa: F401
@@ -0,0 +1,132 @@
+"""Full-text search over course title, subtitle and description.
+
+SQLite uses an external-content FTS5 table (``course_fts``) kept in sync with
+``course`` by triggers; PostgreSQL uses a GIN index over a weighted tsvector
+expression. Both are created by the ``20261016_add_course_search_index``
+migration, which keeps its own frozen copy of the DDL below. When neither is
+present (e.g. a database built with ``create_all``) search falls back to ILIKE.
+
+Like app.db.maintenance, this module must stay importable without application
+settings because scripts/bench_course_search.py uses it.
+"""
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import Float, Integer, case, false, func, literal_column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+FTS5 = "fts5"
+TSVECTOR = "tsvector"
+
+SQLITE_FTS_TABLE = "course_fts"
+# Same DDL as the migration; scripts/bench_course_search.py builds scratch indexes with it
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "title, subtitle, description, content='course', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS course_fts_ai AFTER INSERT ON course BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, subtitle, description) "
+    "VALUES (new.id, new.title, new.subtitle, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS course_fts_ad AFTER DELETE ON course BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, subtitle, description) "
+    "VALUES ('delete', old.id, old.title, old.subtitle, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS course_fts_au AFTER UPDATE OF title, subtitle, description ON course BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, subtitle, description) "
+    "VALUES ('delete', old.id, old.title, old.subtitle, old.description); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, subtitle, description) "
+    "VALUES (new.id, new.title, new.subtitle, new.description); END",
+    # Index the rows that existed before the triggers
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+# bm25 column weights for title, subtitle, description
+SQLITE_RANK = f"bm25({SQLITE_FTS_TABLE}, 10.0, 5.0, 1.0)"
+
+# The query must repeat this expression verbatim for the planner to use the
+# index. 'simple' avoids language-specific stemming (course text is mixed
+# Arabic/English).
+POSTGRES_INDEX = "ix_course_search_tsv"
+POSTGRES_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(subtitle, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C'))"
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_query(search: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    tokens = _TOKEN.findall(search)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+# While no index is found the probe is repeated this often, so a worker that
+# started before the migration ran picks the index up without a restart
+PROBE_INTERVAL_SECONDS = 60.0
+
+_backend: Optional[str] = None
+_probed_at: Optional[float] = None
+
+
+async def detect_backend(db: AsyncSession) -> Optional[str]:
+    """Which full-text index this database has; a found index is remembered for good."""
+    global _backend, _probed_at
+    if _backend is not None or (
+        _probed_at is not None and time.monotonic() - _probed_at < PROBE_INTERVAL_SECONDS
+    ):
+        return _backend
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        found = await db.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SQLITE_FTS_TABLE},
+        )
+        _backend = FTS5 if found else None
+    elif dialect == "postgresql":
+        found = await db.scalar(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+            {"name": POSTGRES_INDEX},
+        )
+        _backend = TSVECTOR if found else None
+    _probed_at = time.monotonic()
+    return _backend
+
+
+def apply_search(query, course, search: str, backend: Optional[str]):
+    """Restrict `query` to courses matching `search`.
+
+    Returns the filtered query and an expression to order by for relevance,
+    or None when `search` has nothing to match on.
+    """
+    if backend == FTS5:
+        match = fts5_query(search)
+        if match is None:
+            # Nothing searchable (e.g. only punctuation): match nothing, like ILIKE would
+            return query.where(false()), None
+        hits = (
+            text(
+                f"SELECT rowid AS course_id, {SQLITE_RANK} AS rank "
+                f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(course_id=Integer, rank=Float)
+            .subquery("course_search")
+        )
+        return query.join(hits, hits.c.course_id == course.id), hits.c.rank.asc()
+
+    if backend == TSVECTOR:
+        vector = literal_column(POSTGRES_VECTOR)
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), search)
+        query = query.where(vector.op("@@")(ts_query))
+        return query, func.ts_rank(vector, ts_query).desc()
+
+    pattern = f"%{search}%"
+    query = query.where(course.title.ilike(pattern) | course.description.ilike(pattern))
+    # Without an index, prefer title matches
+    return query, case((course.title.ilike(pattern), 0), else_=1)
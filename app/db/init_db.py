@@ -8,6 +8,7 @@ from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.course import Course, CourseLevel
 from app.models.lesson import Lesson
+from app.core.lesson_order import GAP
 
 async def create_first_admin():
     async with async_session() as db:
@@ -58,27 +59,28 @@ async def create_demo_data():
                 Lesson(
                     course_id=course.id,
                     title="Getting Started with Python",
-                    order_index=0,
+                    order_index=GAP,
                     content="Learn about Python's features and installation.",
                     is_preview=True
                 ),
                 Lesson(
                     course_id=course.id,
                     title="Variables and Data Types",
-                    order_index=1,
+                    order_index=2 * GAP,
                     content="Understanding Python's basic data types and variables.",
                     is_preview=False
                 ),
                 Lesson(
                     course_id=course.id,
                     title="Control Flow",
-                    order_index=2,
+                    order_index=3 * GAP,
                     content="Learn about if statements, loops, and control structures.",
                     is_preview=False
                 )
             ]
             for lesson in lessons:
                 db.add(lesson)
+            course.lesson_order_tail = 3 * GAP
             
             # Create a demo student
             student = User(
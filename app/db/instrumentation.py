@@ -0,0 +1,149 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDBStats:
+    """Database usage accumulated while serving one HTTP request."""
+
+    __slots__ = ("scope", "connections", "transactions", "queries", "db_time", "statement_counts")
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope
+        self.connections = 0
+        self.transactions = 0
+        self.queries = 0
+        self.db_time = 0.0
+        # SQL text -> executions; parameters are ignored so loops show up
+        self.statement_counts: dict[str, int] = {}
+
+    @property
+    def route(self) -> str | None:
+        """"METHOD /path/template" once routing has matched, else the raw path."""
+        if self.scope is None:
+            return None
+        matched = self.scope.get("route")
+        path = getattr(matched, "path", None) or self.scope.get("path")
+        return f"{self.scope.get('method')} {path}"
+
+    def repeated_statements(self) -> list[tuple[str, int]]:
+        """Statements executed at least DB_N_PLUS_ONE_THRESHOLD times, most repeated first."""
+        threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+        if threshold <= 0:
+            return []
+        repeated = [(sql, n) for sql, n in self.statement_counts.items() if n >= threshold]
+        return sorted(repeated, key=lambda item: -item[1])
+
+    def headers(self) -> dict:
+        headers = {
+            "X-DB-Connections": str(self.connections),
+            "X-DB-Transactions": str(self.transactions),
+            "X-DB-Queries": str(self.queries),
+            "X-DB-Time": f"{self.db_time * 1000:.2f}",  # milliseconds
+        }
+        repeated = self.repeated_statements()
+        if repeated:
+            headers["X-DB-N-Plus-One"] = str(repeated[0][1])
+        return headers
+
+
+_current_stats: ContextVar[RequestDBStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def current_stats() -> RequestDBStats | None:
+    return _current_stats.get()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.connections += 1
+
+
+def _on_begin(conn) -> None:
+    stats = _current_stats.get()
+    # Autocommit connections (read-only sessions) never send BEGIN to the server
+    if stats is not None and conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        stats.transactions += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_time += time.perf_counter() - started
+    stats.statement_counts[statement] = stats.statement_counts.get(statement, 0) + 1
+
+
+def _on_handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # time so the next statement on this connection is not timed against it
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the per-request counters to an engine and its pool."""
+    event.listen(engine.sync_engine, "checkout", _on_checkout)
+    event.listen(engine.sync_engine, "begin", _on_begin)
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _on_handle_error)
+
+
+class RequestDBStatsMiddleware:
+    """ASGI middleware that collects RequestDBStats per request.
+
+    The counters are returned as X-DB-* response headers and logged at debug
+    level once the response has been sent. Statements repeated at least
+    DB_N_PLUS_ONE_THRESHOLD times are logged as a warning (likely N+1) and
+    reported in X-DB-N-Plus-One.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats(scope)
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in stats.headers().items():
+                    headers.append(name, value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            logger.debug(
+                "%s %s connections=%d transactions=%d queries=%d db_time=%.2fms",
+                scope["method"], scope["path"], stats.connections, stats.transactions,
+                stats.queries, stats.db_time * 1000,
+            )
+            for statement, count in stats.repeated_statements():
+                logger.warning(
+                    "Likely N+1 in %s %s: statement executed %d times: %s",
+                    scope["method"], scope["path"], count, statement[:300],
+                )
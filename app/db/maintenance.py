@@ -0,0 +1,29 @@
+"""Data maintenance helpers shared by scripts/ and the admin diagnostics routes.
+
+This module must stay importable without application settings, since the
+cleanup scripts use it outside the running app. Migrations do not import it:
+they inline their SQL so a revision never changes after it is written.
+"""
+from typing import Sequence
+
+
+def dedupe_statement(table: str, key_columns: Sequence[str]) -> str:
+    """SQL that deletes every row but the earliest (lowest id) per combination of `key_columns`.
+
+    Valid on both SQLite and PostgreSQL.
+    """
+    columns = ", ".join(key_columns)
+    return (
+        f"DELETE FROM {table} "
+        f"WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {columns})"
+    )
+
+
+# Recount course.enrollment_count from the enrollment table, touching only
+# courses whose stored count has drifted. Valid on both SQLite and PostgreSQL.
+REPAIR_ENROLLMENT_COUNTS = (
+    "UPDATE course SET enrollment_count = "
+    "(SELECT COUNT(*) FROM enrollment WHERE enrollment.course_id = course.id) "
+    "WHERE enrollment_count <> "
+    "(SELECT COUNT(*) FROM enrollment WHERE enrollment.course_id = course.id)"
+)
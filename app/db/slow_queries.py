@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.instrumentation import current_stats
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "slow_query_start_time"
+
+
+def _parameters_shape(parameters):
+    """Describe bound parameters by type only, so values never reach the log."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _is_select(statement: str) -> bool:
+    words = statement.split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+class SlowQueryLog:
+    """Ring buffer of statements that took longer than SLOW_QUERY_THRESHOLD_MS.
+
+    Each entry records the request route, the shape of the parameters (types,
+    not values), the duration and, for SELECTs, the plan reported by
+    EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (PostgreSQL).
+    """
+
+    def __init__(self, maxlen: int, threshold_ms: float, explain: bool = True):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._entries: deque = deque(maxlen=maxlen)
+
+    def attach(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def entries(self) -> list[dict]:
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - conn.info[_START_KEY].pop()
+        if duration < self.threshold:
+            return
+
+        stats = current_stats()
+        entry = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "route": stats.route if stats is not None else None,
+            "duration_ms": round(duration * 1000, 2),
+            "statement": statement,
+            "parameters": _parameters_shape(parameters),
+            "executemany": executemany,
+            "plan": None,
+        }
+        if self.explain and not executemany and _is_select(statement):
+            entry["plan"] = self._explain(conn, statement, parameters)
+        self._entries.append(entry)
+        logger.warning("Slow query (%.2fms) in %s: %s", entry["duration_ms"], entry["route"], statement[:300])
+
+    def _handle_error(self, exception_context) -> None:
+        # Failed statements skip after_cursor_execute, so pop their start time here
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_KEY):
+            conn.info[_START_KEY].pop()
+
+    @staticmethod
+    def _explain(conn, statement, parameters):
+        if conn.dialect.name == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif conn.dialect.name == "postgresql":
+            prefix = "EXPLAIN "
+        else:
+            return None
+        # Use a raw DBAPI cursor so the EXPLAIN itself is not seen by the
+        # engine events (no recursion, no effect on per-request counters).
+        # EXPLAIN without ANALYZE only plans the statement, it never runs it.
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            # SQLite rows are (id, parent, notused, detail); PostgreSQL has one column
+            return [str(row[-1]) for row in explain_cursor.fetchall()]
+        except Exception as exc:
+            return [f"EXPLAIN failed: {exc}"]
+        finally:
+            explain_cursor.close()
+
+
+slow_query_log = SlowQueryLog(
+    maxlen=settings.SLOW_QUERY_LOG_SIZE,
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
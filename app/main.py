@@ -3,7 +3,12 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.security import PasswordServiceBusy
 from app.api.routes import api_router
+from app.schemas.serializers import ORJSONResponse
+from app.api.compression import CompressionMiddleware
+from app.api.read_your_writes import ReadYourWritesMiddleware
+from app.db.instrumentation import RequestDBStatsMiddleware
 import traceback
 import sqlite3
 import os
@@ -20,6 +25,7 @@ app = FastAPI(
     title="Course Platform API",
     description="API for a Coursera-like online learning platform",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS
@@ -29,8 +35,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Last-Write"],
 )
 
+# Per-request DB connection/transaction counters (X-DB-* headers)
+if settings.DB_REQUEST_STATS:
+    app.add_middleware(RequestDBStatsMiddleware)
+
+# Writes return an X-Last-Write marker so later reads skip the lagging replica
+if settings.READ_DATABASE_URL:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+# Added last so it is outermost and sees every header set above
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        level=settings.COMPRESSION_LEVEL,
+    )
+
 # Include routers
 app.include_router(api_router, prefix="/api/v1")
 
@@ -43,6 +66,16 @@ def read_root():
     }
 
 
+@app.exception_handler(PasswordServiceBusy)
+async def password_service_busy_handler(request: Request, exc: PasswordServiceBusy):
+    # Shed login/registration load instead of letting it queue behind bcrypt
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is temporarily overloaded, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Global exception handler to ensure CORS headers are always present on errors.
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -4,7 +4,7 @@ from enum import Enum
 from typing import List, TYPE_CHECKING
 from decimal import Decimal
 
-from sqlalchemy import String, Enum as SQLEnum, DateTime, ForeignKey, Numeric, Boolean, Float
+from sqlalchemy import String, Enum as SQLEnum, DateTime, ForeignKey, Numeric, Boolean, Float, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -21,6 +21,13 @@ class CourseLevel(str, Enum):
     ADVANCED = "advanced"
 
 class Course(Base):
+    # Keyset pagination of the published catalog (see routes.courses.list_courses)
+    __table_args__ = (
+        Index("ix_course_published_created", "is_published", "created_at", "id"),
+        Index("ix_course_published_rating", "is_published", "average_rating", "id"),
+        Index("ix_course_published_popularity", "is_published", "enrollment_count", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     instructor_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -36,6 +43,12 @@ class Course(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     average_rating: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    # Denormalized COUNT(enrollment); only ever changed with atomic UPDATEs
+    # (see app.db.maintenance.REPAIR_ENROLLMENT_COUNTS for reconciling drift)
+    enrollment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Highest Lesson.order_index handed out; appends take the next key from it
+    # with an atomic UPDATE (see app.core.lesson_order)
+    lesson_order_tail: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     instructor: Mapped[User] = relationship("app.models.user.User", back_populates="courses")
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
     from .lesson import Lesson
 
 class Enrollment(Base):
+    __table_args__ = (
+        Index("ix_enrollment_user_course", "user_id", "course_id", unique=True),
+        Index("ix_enrollment_course_id", "course_id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
     course_id: Mapped[int] = mapped_column(ForeignKey("course.id"), nullable=False)
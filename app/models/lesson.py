@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import String, Integer, Boolean, ForeignKey, DateTime
+from sqlalchemy import String, Integer, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
     from .lesson_completion import LessonCompletion
 
 class Lesson(Base):
+    __table_args__ = (
+        Index("ix_lesson_course_order", "course_id", "order_index"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     course_id: Mapped[int] = mapped_column(ForeignKey("course.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
     from .lesson import Lesson
 
 class LessonCompletion(Base):
+    __table_args__ = (
+        Index("ix_lessoncompletion_user_lesson", "user_id", "lesson_id", unique=True),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
     lesson_id: Mapped[int] = mapped_column(ForeignKey("lesson.id"), nullable=False)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Integer, JSON
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, Integer, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -26,6 +26,8 @@ class Quiz(Base):
 
 
 class Question(Base):
+    __table_args__ = (Index("ix_question_quiz_id", "quiz_id"),)
+
     id: Mapped[int] = mapped_column(primary_key=True)
     quiz_id: Mapped[int] = mapped_column(ForeignKey("quiz.id"), nullable=False)
     text: Mapped[str] = mapped_column(String(2000), nullable=False)
@@ -37,6 +39,8 @@ class Question(Base):
 
 
 class Option(Base):
+    __table_args__ = (Index("ix_option_question_id", "question_id"),)
+
     id: Mapped[int] = mapped_column(primary_key=True)
     question_id: Mapped[int] = mapped_column(ForeignKey("question.id"), nullable=False)
     text: Mapped[str] = mapped_column(String(1000), nullable=False)
@@ -48,6 +52,8 @@ class Option(Base):
 
 
 class QuizAttempt(Base):
+    __table_args__ = (Index("ix_quizattempt_quiz_user", "quiz_id", "user_id"),)
+
     id: Mapped[int] = mapped_column(primary_key=True)
     quiz_id: Mapped[int] = mapped_column(ForeignKey("quiz.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
@@ -63,6 +69,7 @@ class QuizAttempt(Base):
 
 class UserAnswer(Base):
     __tablename__ = 'attemptanswer'
+    __table_args__ = (Index("ix_attemptanswer_attempt_id", "attempt_id"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     attempt_id: Mapped[int] = mapped_column(ForeignKey("quizattempt.id"), nullable=False)
     question_id: Mapped[int] = mapped_column(ForeignKey("question.id"), nullable=False)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from sqlalchemy import String, Integer, ForeignKey, DateTime
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.base import Base
@@ -10,6 +10,11 @@ if TYPE_CHECKING:
     from .course import Course
 
 class Review(Base):
+    __table_args__ = (
+        Index("ix_review_course_user", "course_id", "user_id", unique=True),
+        Index("ix_review_course_created", "course_id", "created_at"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
     course_id: Mapped[int] = mapped_column(ForeignKey("course.id"), nullable=False)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+from sqlalchemy import Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.base import Base
+
+
+class TokenRevocation(Base):
+    """Append-only log of users whose access tokens stopped being valid.
+
+    Written in the same transaction as the role/password change or deletion;
+    every worker polls it for new ids (see app.core.token_versions).
+    """
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # No foreign key: deletions are logged too
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
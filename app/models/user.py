@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, Enum as SQLEnum, DateTime, ForeignKey
+from sqlalchemy import String, Enum as SQLEnum, DateTime, ForeignKey, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -25,6 +25,8 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(SQLEnum(UserRole), nullable=False, default=UserRole.STUDENT)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Embedded in access tokens; incrementing it revokes all previously issued tokens
+    token_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Relationships
     # Use fully-qualified class paths to avoid import-order resolution errors
@@ -19,6 +19,7 @@ class CourseInDBBase(CourseBase):
     created_at: datetime
     updated_at: datetime
     average_rating: float = Field(..., ge=0, le=5)
+    enrollment_count: int = 0
 
 class Course(CourseInDBBase):
     pass
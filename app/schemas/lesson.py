@@ -24,6 +24,20 @@ class LessonInDBBase(LessonBase):
 class Lesson(LessonInDBBase):
     pass
 
+class LessonOutline(BaseSchema):
+    """Sidebar entry for a lesson; never carries `content`."""
+    id: int
+    title: str
+    order_index: int
+    duration_seconds: Optional[int] = None
+    duration: int = 0  # whole minutes, as in the course outline
+    is_preview: bool
+    completed: bool = False
+
 class LessonOrderUpdate(BaseSchema):
     lesson_id: int
     order_index: int
+
+class LessonMove(BaseSchema):
+    # Place the lesson directly after this one; None moves it to the front
+    after_lesson_id: Optional[int] = None
@@ -0,0 +1,48 @@
+"""Precompiled TypeAdapters for hot response payloads.
+
+Handlers that return these serialize once, straight to JSON bytes in
+pydantic-core, instead of FastAPI validating the return value against
+`response_model`, converting it to Python primitives and then encoding it
+again. `response_model` stays declared on those routes for the OpenAPI schema.
+"""
+from typing import Any, List
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.schemas.course import Course
+from app.schemas.enrollment import EnrollmentWithProgress
+from app.schemas.lesson import Lesson, LessonOutline
+from app.schemas.quiz import Quiz, QuizAttempt, QuizPublic
+from app.schemas.review import Review
+
+course_list = TypeAdapter(List[Course])
+review_list = TypeAdapter(List[Review])
+enrollment_progress_list = TypeAdapter(List[EnrollmentWithProgress])
+lesson_list = TypeAdapter(List[Lesson])
+lesson_outline_list = TypeAdapter(List[LessonOutline])
+quiz_detail = TypeAdapter(Quiz)
+quiz_public = TypeAdapter(QuizPublic)
+quiz_attempt_list = TypeAdapter(List[QuizAttempt])
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson.
+
+    Stands in for fastapi.responses.ORJSONResponse, which newer FastAPI
+    releases deprecate with a warning on every response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dump_json(adapter: TypeAdapter, value: Any) -> bytes:
+    """Serialize ORM objects or schema instances with `adapter` in one pass."""
+    return adapter.dump_json(adapter.validate_python(value))
+
+
+def json_response(adapter: TypeAdapter, value: Any) -> Response:
+    return Response(content=dump_json(adapter, value), media_type="application/json")
@@ -42,7 +42,18 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     expires_in: int
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class TokenPayload(BaseModel):
     sub: str
     exp: Optional[int] = None
+    role: Optional[str] = None
+    ver: Optional[int] = None
+
+class Principal(BaseModel):
+    """Identity and role of the caller, taken from verified access token claims."""
+    id: int
+    role: UserRole
@@ -8,6 +8,9 @@ export const api = axios.create({
   },
 })
 
+// Latest X-Last-Write marker from the API, echoed so reads after a write skip the replica
+let lastWrite = null
+
 // Request interceptor for API calls
 api.interceptors.request.use(
   (config) => {
@@ -15,6 +18,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers['Authorization'] = `Bearer ${token}`
     }
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite
+    }
     return config
   },
   (error) => {
@@ -22,13 +28,50 @@ api.interceptors.request.use(
   }
 )
 
+// Exchange the stored refresh token for a new access token. Concurrent 401s
+// share one in-flight refresh so the rotated token is only spent once.
+let refreshPromise = null
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token')
+    refreshPromise = api
+      .post('/auth/refresh', { refresh_token: refreshToken }, { _skipRefresh: true })
+      .then(({ data }) => {
+        localStorage.setItem('token', data.access_token)
+        localStorage.setItem('refresh_token', data.refresh_token)
+        return data.access_token
+      })
+      .finally(() => {
+        refreshPromise = null
+      })
+  }
+  return refreshPromise
+}
+
 // Response interceptor for API calls
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.headers['x-last-write']) {
+      lastWrite = response.headers['x-last-write']
+    }
+    return response
+  },
   async (error) => {
+  const original = error.config
+  if (error.response?.status === 401 && original && !original._retry && !original._skipRefresh && localStorage.getItem('refresh_token')) {
+      original._retry = true
+      try {
+        const token = await refreshAccessToken()
+        original.headers['Authorization'] = `Bearer ${token}`
+        return api(original)
+      } catch (e) {
+        // fall through to logout handling below
+      }
+    }
   if (error.response?.status === 401) {
       // Clear stored auth and notify app (avoids full page reload)
       localStorage.removeItem('token')
+      localStorage.removeItem('refresh_token')
       localStorage.removeItem('user')
       try {
         window.dispatchEvent(new Event('authChanged'))
@@ -76,6 +119,7 @@ export const authAPI = {
     })
   },
   me: () => api.get('/auth/me'),
+  logout: (refreshToken) => api.post('/auth/logout', { refresh_token: refreshToken }),
 }
 
 export const coursesAPI = {
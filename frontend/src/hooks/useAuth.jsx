@@ -92,6 +92,7 @@ export function AuthProvider({ children }) {
         throw new Error('No token received from server')
       }
       localStorage.setItem('token', token)
+      if (data.refresh_token) localStorage.setItem('refresh_token', data.refresh_token)
 
       const userObj = data.user ?? data
       if (!userObj) {
@@ -123,6 +124,7 @@ export function AuthProvider({ children }) {
     try {
       const { data } = await authAPI.register(userData)
       localStorage.setItem('token', data.access_token ?? data.token)
+      if (data.refresh_token) localStorage.setItem('refresh_token', data.refresh_token)
 
       const userObj = data.user ?? data
       const normalizedUser = {
@@ -148,6 +150,9 @@ export function AuthProvider({ children }) {
   }
 
   const logout = () => {
+    const refreshToken = localStorage.getItem('refresh_token')
+    if (refreshToken) authAPI.logout(refreshToken).catch(() => {})
+    localStorage.removeItem('refresh_token')
     localStorage.removeItem('token')
     localStorage.removeItem('user')
     setUser(null)
@@ -0,0 +1,80 @@
+"""
+Benchmark course search: ILIKE scan vs the SQLite FTS5 index.
+
+Builds a throwaway SQLite database with N synthetic courses (long
+descriptions, like production), installs the same FTS5 table and triggers as
+the 20261016_add_course_search_index migration, and times both query paths.
+
+Usage: python scripts/bench_course_search.py [N]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app.db.course_search import SQLITE_CREATE, SQLITE_FTS_TABLE, SQLITE_RANK, fts5_query  # noqa: E402
+
+WORDS = (
+    "python math science arabic reading writing drawing music history geography "
+    "coding robots animals space planets stories games numbers colors shapes"
+).split()
+QUERIES = ["python", "space planets", "arabic stories", "zebra"]
+REPEAT = 20
+
+
+def build(conn, n):
+    conn.execute(
+        "CREATE TABLE course (id INTEGER PRIMARY KEY, title TEXT NOT NULL, subtitle TEXT, "
+        "description TEXT NOT NULL, is_published BOOLEAN NOT NULL, created_at TEXT NOT NULL)"
+    )
+    rng = random.Random(42)
+    rows = []
+    for i in range(n):
+        title = " ".join(rng.choices(WORDS, k=4))
+        description = " ".join(rng.choices(WORDS + ["lorem", "ipsum", "dolor"] * 20, k=1200))
+        rows.append((i + 1, title, None, description, 1, f"2026-01-01T00:00:{i % 60:02d}"))
+    conn.executemany("INSERT INTO course VALUES (?, ?, ?, ?, ?, ?)", rows)
+    for statement in SQLITE_CREATE:
+        conn.execute(statement)
+    conn.commit()
+
+
+def timed(conn, sql, params):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        rows = conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - started) / REPEAT * 1000, len(rows)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        print(f"Building {n} courses...")
+        build(conn, n)
+
+        ilike = (
+            "SELECT id FROM course WHERE is_published = 1 "
+            "AND (title LIKE ? OR description LIKE ?) ORDER BY created_at DESC LIMIT 10"
+        )
+        fts = (
+            f"SELECT course.id FROM course JOIN (SELECT rowid AS course_id, {SQLITE_RANK} AS rank "
+            f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH ?) AS hits "
+            "ON hits.course_id = course.id WHERE course.is_published = 1 "
+            "ORDER BY hits.rank, course.created_at DESC LIMIT 10"
+        )
+        print(f"{'query':<16}{'ILIKE ms':>10}{'FTS5 ms':>10}{'speedup':>10}")
+        for q in QUERIES:
+            like_ms, _ = timed(conn, ilike, (f"%{q}%", f"%{q}%"))
+            fts_ms, _ = timed(conn, fts, (fts5_query(q),))
+            print(f"{q:<16}{like_ms:>10.2f}{fts_ms:>10.2f}{like_ms / fts_ms:>9.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark lesson reorder: per-lesson round trips vs the set-based statements.
+
+Reproduces the SQL of the old reorder_lessons (a SELECT per lesson to
+validate, then a SELECT + UPDATE per lesson) and of the new one (one SELECT
+for the course's lessons, one UPDATE ... CASE) against a throwaway SQLite
+database, reversing the order of an N-lesson course.
+
+Usage: python scripts/bench_lesson_reorder.py [N]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPEAT = 10
+
+
+def build(conn, n):
+    conn.execute(
+        "CREATE TABLE lesson (id INTEGER PRIMARY KEY, course_id INTEGER NOT NULL, "
+        "title TEXT NOT NULL, order_index INTEGER NOT NULL, updated_at TEXT)"
+    )
+    conn.execute("CREATE INDEX ix_lesson_course_order ON lesson (course_id, order_index)")
+    conn.executemany(
+        "INSERT INTO lesson (id, course_id, title, order_index) VALUES (?, 1, ?, ?)",
+        [(i, f"Lesson {i}", i) for i in range(1, n + 1)],
+    )
+    conn.commit()
+
+
+def per_lesson(conn, orders):
+    statements = 0
+    for lesson_id, _ in orders:
+        conn.execute("SELECT * FROM lesson WHERE id = ? AND course_id = 1", (lesson_id,)).fetchone()
+        statements += 1
+    for lesson_id, index in orders:
+        conn.execute("SELECT * FROM lesson WHERE id = ?", (lesson_id,)).fetchone()
+        conn.execute("UPDATE lesson SET order_index = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (index, lesson_id))
+        statements += 2
+    conn.commit()
+    return statements
+
+
+def set_based(conn, orders):
+    dict(conn.execute("SELECT id, order_index FROM lesson WHERE course_id = 1").fetchall())
+    whens = " ".join("WHEN ? THEN ?" for _ in orders)
+    params = [value for pair in orders for value in pair] + [lesson_id for lesson_id, _ in orders]
+    placeholders = ", ".join("?" for _ in orders)
+    conn.execute(
+        f"UPDATE lesson SET order_index = CASE id {whens} END, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE id IN ({placeholders})",
+        params,
+    )
+    conn.commit()
+    return 2
+
+
+def timed(conn, fn, orders):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        statements = fn(conn, orders)
+    return (time.perf_counter() - started) / REPEAT * 1000, statements
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    orders = [(lesson_id, n + 1 - lesson_id) for lesson_id in range(1, n + 1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        build(conn, n)
+        old_ms, old_statements = timed(conn, per_lesson, orders)
+        new_ms, new_statements = timed(conn, set_based, orders)
+        order = [row[0] for row in conn.execute("SELECT id FROM lesson ORDER BY order_index LIMIT 3")]
+        assert order == [n, n - 1, n - 2], order
+        conn.close()
+    print(f"{n} lessons")
+    print(f"  per-lesson: {old_statements:>5} statements {old_ms:>9.2f} ms")
+    print(f"  set-based:  {new_statements:>5} statements {new_ms:>9.2f} ms ({old_ms / new_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark response serialization: FastAPI's response_model path vs the fast path.
+
+"before" mirrors what FastAPI does for a handler that returns data with a
+response_model: validate against the model, dump to Python primitives, then
+encode with the stdlib json module (Starlette's JSONResponse).
+"after" is what the hot handlers do now: orjson.dumps for payloads that are
+already plain dicts, and a precompiled TypeAdapter.dump_json for schemas.
+
+Reports CPU microseconds per request-sized payload.
+
+Usage: python scripts/bench_serialization.py
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.schemas.course import Course  # noqa: E402
+from app.schemas.quiz import QuizPublic  # noqa: E402
+
+ROUNDS = 2000
+NOW = datetime(2026, 10, 16, 12, 0, 0)
+
+
+def course(i):
+    return {
+        "id": i, "instructor_id": 1, "title": f"Course {i}", "subtitle": "Learn by playing",
+        "description": "Lorem ipsum dolor sit amet. " * 40, "category": "math", "language": "ar",
+        "level": "beginner", "price": 19.99, "thumbnail_url": None, "promo_video_url": None,
+        "is_published": True, "created_at": NOW, "updated_at": NOW, "average_rating": 4.5,
+        "enrollment_count": 120,
+    }
+
+
+def quiz():
+    return {
+        "id": 1, "course_id": 1, "title": "Numbers", "allow_retry": True, "created_at": NOW, "updated_at": NOW,
+        "questions": [
+            {"id": q, "text": f"Question {q}?", "order_index": q,
+             "options": [{"id": q * 10 + o, "text": f"Option {o}"} for o in range(4)]}
+            for q in range(30)
+        ],
+    }
+
+
+def before(adapter, payload):
+    value = adapter.validate_python(payload)
+    primitives = adapter.dump_python(value, mode="json")
+    return json.dumps(primitives, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def cpu_us(fn, *args):
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        fn(*args)
+    return (time.process_time() - started) / ROUNDS * 1e6
+
+
+def main():
+    courses = [course(i) for i in range(20)]
+    course_list = TypeAdapter(List[Course])
+    course_models = course_list.validate_python(courses)
+    quiz_adapter = TypeAdapter(QuizPublic)
+    quiz_payload = quiz()
+
+    cases = [
+        ("catalog page (20 courses, schema)", lambda: before(course_list, courses),
+         lambda: course_list.dump_json(course_list.validate_python(course_models))),
+        ("quiz detail (30 questions, dict)", lambda: before(quiz_adapter, quiz_payload),
+         lambda: orjson.dumps(quiz_payload)),
+    ]
+    print(f"{'payload':<38}{'before us':>12}{'after us':>12}{'speedup':>10}")
+    for name, slow, fast in cases:
+        slow_us, fast_us = cpu_us(slow), cpu_us(fast)
+        print(f"{name:<38}{slow_us:>12.1f}{fast_us:>12.1f}{slow_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,13 @@ WARNING: Run in development only. The script makes backups before changes.
 import sqlite3
 import shutil
 import os
+import sys
 from datetime import datetime
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app.db.maintenance import dedupe_statement  # noqa: E402
 DB_PATH = os.path.join(BASE_DIR, 'course_platform.db')
 BACKUP_DIR = os.path.join(BASE_DIR, 'db_backups')
 
@@ -95,19 +99,8 @@ def dedupe_lesson_completions(conn):
     if not table_exists(conn, 'lessoncompletion'):
         print('No lessoncompletion table found, skipping dedupe')
         return
-    # Create a temp table of unique pairs with min id
-    run_sql(conn, '''
-        CREATE TABLE IF NOT EXISTS _lc_keep AS
-        SELECT MIN(id) as keep_id
-        FROM lessoncompletion
-        GROUP BY user_id, lesson_id;
-    ''')
-    # Delete rows not in keep set
-    run_sql(conn, '''
-        DELETE FROM lessoncompletion
-        WHERE id NOT IN (SELECT keep_id FROM _lc_keep)
-    ''')
-    run_sql(conn, 'DROP TABLE IF EXISTS _lc_keep')
+    # Shared with the alembic migration that adds the unique indexes
+    run_sql(conn, dedupe_statement('lessoncompletion', ('user_id', 'lesson_id')))
 
 
 def add_unique_index(conn):
@@ -118,7 +111,7 @@ def add_unique_index(conn):
     if cur.fetchone():
         print('Unique index already exists, skipping')
         return
-    run_sql(conn, 'CREATE UNIQUE INDEX idx_lessoncompletion_user_lesson ON lessoncompletion (user_id, lesson_id)')
+    run_sql(conn, 'CREATE UNIQUE INDEX ix_lessoncompletion_user_lesson ON lessoncompletion (user_id, lesson_id)')
 
 
 def main():
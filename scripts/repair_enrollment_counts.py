@@ -0,0 +1,32 @@
+"""
+Reconcile course.enrollment_count with the enrollment table.
+
+The counter is maintained by the enroll and user-delete routes; this repairs
+drift caused by writes that bypass them (manual SQL, restores, scripts).
+Safe to run at any time, e.g. from cron: only drifted courses are updated.
+
+Usage: python scripts/repair_enrollment_counts.py [path/to/db]
+"""
+import os
+import sqlite3
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app.db.maintenance import REPAIR_ENROLLMENT_COUNTS  # noqa: E402
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, 'course_platform.db')
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute(REPAIR_ENROLLMENT_COUNTS)
+        conn.commit()
+        print(f'Repaired enrollment_count on {cur.rowcount} course(s)')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.cache import catalog_version
+from app.core.security import get_password_hash
+from app.models.course import Course, CourseLevel
+from app.models.user import User, UserRole
+
+
+async def _instructor(test_db) -> User:
+    # The test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == "catalog_instructor@example.com"))
+    if user is not None:
+        return user
+    user = User(
+        email="catalog_instructor@example.com",
+        full_name="Catalog Instructor",
+        hashed_password=get_password_hash("catalogpass"),
+        role=UserRole.INSTRUCTOR
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+async def test_catalog_page_served_precompressed_with_weak_etag(client: AsyncClient, test_db):
+    instructor = await _instructor(test_db)
+    # Enough rows that the page is over the compression threshold
+    for n in range(10):
+        test_db.add(Course(
+            instructor_id=instructor.id,
+            title=f"Compressed Course {n}",
+            description="A description long enough to make the page worth compressing. " * 3,
+            category="Testing",
+            language="English",
+            level=CourseLevel.BEGINNER,
+            is_published=True
+        ))
+    await test_db.commit()
+    catalog_version.bump()  # written outside the API, so drop cached pages
+
+    url = "/api/v1/courses?limit=10&category=Testing"
+    plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    strong = plain.headers["etag"]
+    assert not strong.startswith("W/")
+
+    resp = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["etag"] == f"W/{strong}"
+    # httpx decodes the body, so this compares the decompressed JSON
+    assert resp.json() == plain.json()
+
+    # Either validator revalidates the cached entry
+    for etag in (strong, f"W/{strong}"):
+        resp = await client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert resp.status_code == 304
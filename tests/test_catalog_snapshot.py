@@ -0,0 +1,51 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.core.catalog_snapshot import CatalogSnapshot, CourseRecord
+from app.core.pagination import decode_cursor
+
+
+def _course(id, category, level, price, created_day, rating, enrollments):
+    fields = dict.fromkeys(CourseRecord.__slots__)
+    fields.update(
+        id=id, category=category, level=level, price=price, is_published=True,
+        created_at=datetime(2026, 1, created_day), average_rating=rating, enrollment_count=enrollments,
+    )
+    return SimpleNamespace(**fields)
+
+
+COURSES = [
+    _course(1, "math", "beginner", None, 1, 4.0, 3),
+    _course(2, "math", "advanced", 20, 2, 4.5, 3),
+    _course(3, "art", "beginner", 0, 2, 3.0, 10),
+    _course(4, "math", "beginner", 50, 3, 4.5, 0),
+    _course(5, "art", "advanced", 10, 4, 5.0, 1),
+]
+
+
+def _ids(records):
+    return [record.id for record in records]
+
+
+def test_snapshot_orders_match_sql_tie_breaking():
+    snapshot = CatalogSnapshot(COURSES, version=(0, 0))
+
+    def page(order):
+        return _ids(snapshot.page(order, 0, 10, None, None, None, None, None)[0])
+
+    assert page("newest") == [5, 4, 3, 2, 1]
+    assert page("rating") == [5, 4, 2, 1, 3]
+    assert page("popularity") == [3, 2, 1, 5, 4]
+
+
+def test_snapshot_filters_and_cursor_pages():
+    snapshot = CatalogSnapshot(COURSES, version=(0, 0))
+    # No price never matches a price bound, as in SQL
+    assert _ids(snapshot.page("newest", 0, 10, "math", None, 10, None, None)[0]) == [4, 2]
+
+    first, cursor = snapshot.page("popularity", 0, 2, None, "beginner", None, None, None)
+    assert _ids(first) == [3, 1]
+    after = decode_cursor(cursor, "popularity", (int, int))
+    second, cursor = snapshot.page("popularity", 0, 2, None, "beginner", None, None, after)
+    assert _ids(second) == [4]
+    assert cursor is None
@@ -0,0 +1,74 @@
+import asyncio
+import gzip
+
+from app.api.compression import CompressionMiddleware, accepts_gzip, is_compressible
+
+
+def _run(body_chunks, content_type=b"application/json", accept=b"gzip, deflate", extra_headers=(), minimum_size=100):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), *extra_headers]
+        if len(body_chunks) == 1:
+            headers.append((b"content-length", str(len(body_chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(body_chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(body_chunks) - 1})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept)] if accept else []}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, None, send))
+    headers = {key.decode(): value.decode() for key, value in sent[0]["headers"]}
+    return headers, b"".join(message.get("body", b"") for message in sent[1:])
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0, *")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert not is_compressible("text/event-stream")
+    assert not is_compressible("image/png")
+    assert not is_compressible(None)
+
+
+def test_large_json_is_gzipped():
+    body = b'{"content": "' + b"lesson " * 100 + b'"}'
+    headers, sent = _run([body], extra_headers=[(b"etag", b'"abc"')])
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == 'W/"abc"'
+    assert int(headers["content-length"]) == len(sent)
+    assert gzip.decompress(sent) == body
+
+
+def test_streamed_body_is_gzipped():
+    chunks = [b"a" * 50, b"b" * 50, b"c" * 50]
+    headers, sent = _run(chunks)
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(sent) == b"".join(chunks)
+
+
+def test_passthrough_cases():
+    body = b"x" * 500
+    # Small body
+    headers, sent = _run([b"{}"])
+    assert "content-encoding" not in headers and sent == b"{}"
+    # Client does not accept gzip: body untouched but caches must still vary
+    headers, sent = _run([body], accept=None)
+    assert "content-encoding" not in headers and headers["vary"] == "Accept-Encoding" and sent == body
+    # Not on the allowlist
+    headers, sent = _run([body], content_type=b"image/png")
+    assert "content-encoding" not in headers and "vary" not in headers and sent == body
+    # Already encoded (e.g. a precompressed cache entry)
+    headers, sent = _run([body], extra_headers=[(b"content-encoding", b"gzip")])
+    assert headers["content-encoding"] == "gzip" and sent == body
@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+
+from app.core.course_facets import CourseFacetIndex, price_bucket
+
+
+def _course(course_id, category, level, price, is_published=True):
+    return SimpleNamespace(id=course_id, category=category, level=level, price=price, is_published=is_published)
+
+
+def _index(*courses) -> CourseFacetIndex:
+    index = CourseFacetIndex(reload_interval=3600)
+    # Treat the index as freshly loaded so counts() never reaches the database
+    index._loaded_at = time.monotonic()
+    for course in courses:
+        index.upsert(course)
+    return index
+
+
+def _counts(facet: list) -> dict:
+    return {item["value"]: item["count"] for item in facet if item["count"]}
+
+
+def test_price_buckets():
+    assert [price_bucket(p) for p in (None, 0, 10, 25, 99.99, 100)] == ["free", "free", "0-25", "25-50", "50-100", "100+"]
+
+
+async def test_counts_exclude_each_facets_own_filter():
+    index = _index(
+        _course(1, "Math", "beginner", None),
+        _course(2, "Math", "advanced", 30),
+        _course(3, "Art", "beginner", 30),
+        _course(4, "Art", "beginner", 150, is_published=False),
+    )
+
+    everything = await index.counts()
+    assert everything["total"] == 3
+    assert _counts(everything["category"]) == {"Math": 2, "Art": 1}
+    assert _counts(everything["price"]) == {"free": 1, "25-50": 2}
+
+    math = await index.counts(category="Math")
+    assert math["total"] == 2
+    # Other categories are still counted so the client can offer them
+    assert _counts(math["category"]) == {"Math": 2, "Art": 1}
+    assert _counts(math["level"]) == {"beginner": 1, "advanced": 1}
+
+    # No price never matches a price bound, as in SQL
+    priced = await index.counts(min_price=0)
+    assert priced["total"] == 2
+
+
+async def test_updates_move_courses_between_facets():
+    index = _index(_course(1, "Math", "beginner", 10))
+    index.upsert(_course(1, "Art", "beginner", 10))
+    assert _counts((await index.counts())["category"]) == {"Art": 1}
+
+    index.upsert(_course(1, "Art", "beginner", 10, is_published=False))
+    assert (await index.counts())["total"] == 0
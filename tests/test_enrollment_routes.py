@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.core.security import get_password_hash
+from app.models.course import Course, CourseLevel
+from app.models.user import User, UserRole
+
+
+async def _get_or_create_user(test_db, email: str, role: UserRole) -> User:
+    # The test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == email))
+    if user is not None:
+        return user
+    user = User(email=email, full_name=email.split("@")[0], hashed_password=get_password_hash("enrollpass"), role=role)
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+@pytest.fixture
+async def admin(test_db):
+    return await _get_or_create_user(test_db, "enroll_admin@example.com", UserRole.ADMIN)
+
+
+@pytest.fixture
+async def course(test_db):
+    instructor = await _get_or_create_user(test_db, "enroll_instructor@example.com", UserRole.INSTRUCTOR)
+    course = Course(
+        instructor_id=instructor.id,
+        title="Counted Course",
+        description="Course for enrollment counts",
+        category="Testing",
+        language="English",
+        level=CourseLevel.BEGINNER,
+        is_published=True
+    )
+    test_db.add(course)
+    await test_db.commit()
+    return course
+
+
+async def _student(test_db) -> User:
+    return await _get_or_create_user(test_db, f"enroll_{uuid.uuid4().hex[:8]}@example.com", UserRole.STUDENT)
+
+
+async def _headers(client: AsyncClient, user: User) -> dict:
+    resp = await client.post("/api/v1/auth/login", data={"username": user.email, "password": "enrollpass"})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def _count(test_db, course: Course) -> int:
+    return await test_db.scalar(select(Course.enrollment_count).where(Course.id == course.id))
+
+
+async def test_enrollment_count_follows_enrollments(client: AsyncClient, test_db, admin: User, course: Course):
+    first, second = await _student(test_db), await _student(test_db)
+    first_headers = await _headers(client, first)
+
+    assert (await client.post(f"/api/v1/courses/{course.id}/enroll", headers=first_headers)).status_code == 200
+    assert (await client.post(f"/api/v1/courses/{course.id}/enroll", headers=await _headers(client, second))).status_code == 200
+    assert await _count(test_db, course) == 2
+
+    # A repeated enrollment is refused and not counted
+    assert (await client.post(f"/api/v1/courses/{course.id}/enroll", headers=first_headers)).status_code == 400
+    assert await _count(test_db, course) == 2
+
+    # Deleting a user removes their enrollments from the count
+    resp = await client.delete(f"/api/v1/users/{first.id}", headers=await _headers(client, admin))
+    assert resp.status_code == 200, resp.text
+    assert await _count(test_db, course) == 1
+
+
+async def test_repair_recounts_drifted_courses(client: AsyncClient, test_db, admin: User, course: Course):
+    student = await _student(test_db)
+    await client.post(f"/api/v1/courses/{course.id}/enroll", headers=await _headers(client, student))
+    await test_db.execute(update(Course).where(Course.id == course.id).values(enrollment_count=42))
+    await test_db.commit()
+
+    resp = await client.post("/api/v1/admin/diagnostics/repair-enrollment-counts", headers=await _headers(client, admin))
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["repaired"] >= 1
+    assert await _count(test_db, course) == 1
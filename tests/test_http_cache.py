@@ -0,0 +1,46 @@
+import gzip
+
+from starlette.requests import Request
+
+from app.api.compression import gzip_body
+from app.api.http_cache import etag_for, json_response
+
+
+def _request(if_none_match=None, accept_encoding=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    if accept_encoding:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_json_response_serves_body_with_etag():
+    body = b'[{"id": 1}]'
+    response = json_response(_request(), body, etag_for(body), {"X-Next-Cursor": "abc"})
+    assert response.status_code == 200
+    assert response.body == body
+    assert response.headers["etag"] == etag_for(body)
+    assert response.headers["x-next-cursor"] == "abc"
+
+
+def test_json_response_not_modified_for_matching_etag():
+    body = b"[]"
+    etag = etag_for(body)
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = json_response(_request(header), body, etag)
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+    assert json_response(_request('"stale"'), body, etag).status_code == 200
+
+
+def test_json_response_serves_precompressed_body_to_gzip_clients():
+    body = b'[{"id": 1}]' * 200
+    etag = etag_for(body)
+    gzipped = gzip_body(body)
+    response = json_response(_request(accept_encoding="gzip"), body, etag, gzipped=gzipped)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f"W/{etag}"
+    assert gzip.decompress(response.body) == body
+    plain = json_response(_request(), body, etag, gzipped=gzipped)
+    assert "content-encoding" not in plain.headers
+    assert plain.body == body
+    assert plain.headers["vary"] == "Accept-Encoding"
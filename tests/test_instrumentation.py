@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.instrumentation import instrument_engine
+from app.db.slow_queries import SlowQueryLog
+
+
+async def test_failed_statement_does_not_leak_start_times():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    SlowQueryLog(maxlen=10, threshold_ms=1000).attach(engine)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            info = conn.sync_connection.info
+            assert info["query_start_time"] == []
+            assert info["slow_query_start_time"] == []
+    finally:
+        await engine.dispose()
@@ -0,0 +1,21 @@
+from app.core.lesson_order import GAP, key_between, needs_rebalance, spaced_keys
+
+
+def test_key_between_neighbours():
+    assert key_between(GAP, 2 * GAP) == GAP + GAP // 2
+    assert key_between(None, GAP) == GAP // 2
+    assert key_between(3 * GAP, None) == 4 * GAP
+    assert key_between(None, None) == GAP
+
+
+def test_key_between_reports_exhausted_gap():
+    assert key_between(5, 6) is None
+    assert key_between(None, 1) is None
+    assert key_between(5, 7) == 6
+    assert needs_rebalance(5, 6, 7)
+    assert not needs_rebalance(GAP, GAP + GAP // 2, 2 * GAP)
+
+
+def test_spaced_keys():
+    assert spaced_keys(3) == [GAP, 2 * GAP, 3 * GAP]
+    assert spaced_keys(0) == []
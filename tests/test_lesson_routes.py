@@ -0,0 +1,211 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.core.lesson_order import GAP
+from app.core.security import get_password_hash
+from app.models.user import User, UserRole
+from app.models.course import Course, CourseLevel
+from app.models.lesson import Lesson
+
+
+@pytest.fixture
+async def instructor(test_db):
+    # Shared by every test here; the test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == "lesson_instructor@example.com"))
+    if user is not None:
+        return user
+    user = User(
+        email="lesson_instructor@example.com",
+        full_name="Lesson Instructor",
+        hashed_password=get_password_hash("instrpass"),
+        role=UserRole.INSTRUCTOR
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+@pytest.fixture
+async def student(test_db):
+    # Fresh per test: enrollment state is what these tests are about
+    user = User(
+        email=f"lesson_student_{uuid.uuid4().hex[:8]}@example.com",
+        full_name="Lesson Student",
+        hashed_password=get_password_hash("instrpass"),
+        role=UserRole.STUDENT
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+@pytest.fixture
+async def course(test_db, instructor: User):
+    course = Course(
+        instructor_id=instructor.id,
+        title="Ordering Course",
+        description="Course for lesson ordering",
+        category="Testing",
+        language="English",
+        level=CourseLevel.BEGINNER,
+        is_published=True
+    )
+    test_db.add(course)
+    await test_db.commit()
+    return course
+
+
+async def _login(client: AsyncClient, user: User) -> dict:
+    resp = await client.post("/api/v1/auth/login", data={"username": user.email, "password": "instrpass"})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def _create_lessons(client: AsyncClient, headers: dict, course_id: int, titles) -> list:
+    lessons = []
+    for title in titles:
+        resp = await client.post(
+            f"/api/v1/courses/{course_id}/lessons",
+            json={"title": title, "content": f"{title} content"},
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+        lessons.append(resp.json())
+    return lessons
+
+
+async def _titles_in_order(client: AsyncClient, headers: dict, course_id: int) -> list:
+    resp = await client.get(f"/api/v1/courses/{course_id}/lessons", headers=headers)
+    assert resp.status_code == 200
+    return [lesson["title"] for lesson in resp.json()]
+
+
+async def test_create_appends_after_tail(client: AsyncClient, test_db, instructor: User, course: Course):
+    headers = await _login(client, instructor)
+    lessons = await _create_lessons(client, headers, course.id, ["A", "B", "C"])
+
+    assert [lesson["order_index"] for lesson in lessons] == [GAP, 2 * GAP, 3 * GAP]
+    tail = await test_db.scalar(select(Course.lesson_order_tail).where(Course.id == course.id))
+    assert tail == 3 * GAP
+
+
+async def test_move_to_front(client: AsyncClient, instructor: User, course: Course):
+    headers = await _login(client, instructor)
+    a, b, c = await _create_lessons(client, headers, course.id, ["A", "B", "C"])
+
+    resp = await client.post(
+        f"/api/v1/courses/{course.id}/lessons/{c['id']}/move",
+        json={"after_lesson_id": None},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["order_index"] == GAP // 2
+    assert await _titles_in_order(client, headers, course.id) == ["C", "A", "B"]
+
+
+async def test_move_between_adjacent_keys_rebalances(client: AsyncClient, test_db, instructor: User, course: Course):
+    headers = await _login(client, instructor)
+    a, b, c = await _create_lessons(client, headers, course.id, ["A", "B", "C"])
+    # Leave no room between A and B
+    for lesson, key in ((a, 1), (b, 2), (c, 3)):
+        await test_db.execute(update(Lesson).where(Lesson.id == lesson["id"]).values(order_index=key))
+    await test_db.commit()
+
+    resp = await client.post(
+        f"/api/v1/courses/{course.id}/lessons/{c['id']}/move",
+        json={"after_lesson_id": a["id"]},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    # Respaced inline to GAP, 2*GAP, ..., then placed at the midpoint of A and B
+    assert resp.json()["order_index"] == GAP + GAP // 2
+    result = await test_db.execute(
+        select(Lesson.id, Lesson.order_index).where(Lesson.id.in_([a["id"], b["id"]]))
+    )
+    assert dict(result.all()) == {a["id"]: GAP, b["id"]: 2 * GAP}
+    assert await _titles_in_order(client, headers, course.id) == ["A", "C", "B"]
+
+
+async def test_reorder_applies_all_indexes_and_rejects_clashes(client: AsyncClient, test_db, instructor: User, course: Course):
+    headers = await _login(client, instructor)
+    a, b, c = await _create_lessons(client, headers, course.id, ["A", "B", "C"])
+
+    resp = await client.patch(
+        f"/api/v1/courses/{course.id}/lessons/reorder",
+        json=[{"lesson_id": a["id"], "order_index": 3 * GAP}, {"lesson_id": c["id"], "order_index": GAP}],
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    assert await _titles_in_order(client, headers, course.id) == ["C", "B", "A"]
+
+    # B keeps 2*GAP, so giving it to A would produce two lessons at one index
+    resp = await client.patch(
+        f"/api/v1/courses/{course.id}/lessons/reorder",
+        json=[{"lesson_id": a["id"], "order_index": 2 * GAP}],
+        headers=headers,
+    )
+    assert resp.status_code == 400
+    other_course = Course(
+        instructor_id=instructor.id,
+        title="Other Course",
+        description="Holds a lesson from another course",
+        category="Testing",
+        language="English",
+        level=CourseLevel.BEGINNER,
+    )
+    test_db.add(other_course)
+    await test_db.commit()
+    (other,) = await _create_lessons(client, headers, other_course.id, ["X"])
+    resp = await client.patch(
+        f"/api/v1/courses/{course.id}/lessons/reorder",
+        json=[{"lesson_id": other["id"], "order_index": 9 * GAP}],
+        headers=headers,
+    )
+    assert resp.status_code == 404
+    assert await _titles_in_order(client, headers, course.id) == ["C", "B", "A"]
+
+
+async def test_outline_is_default_and_omits_content(client: AsyncClient, instructor: User, student: User, course: Course):
+    headers = await _login(client, instructor)
+    await _create_lessons(client, headers, course.id, ["A"])
+    resp = await client.post(
+        f"/api/v1/courses/{course.id}/lessons",
+        json={"title": "Preview", "content": "Preview content", "is_preview": True, "duration_seconds": 150},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+
+    outline = (await client.get(f"/api/v1/courses/{course.id}/lessons", headers=headers)).json()
+    assert [lesson["title"] for lesson in outline] == ["A", "Preview"]
+    assert all("content" not in lesson for lesson in outline)
+    assert outline[1]["duration"] == 2
+    assert outline[1]["completed"] is False
+
+    full = (await client.get(f"/api/v1/courses/{course.id}/lessons?view=full", headers=headers)).json()
+    assert [lesson["content"] for lesson in full] == ["A content", "Preview content"]
+
+    # Students who are not enrolled only get preview lessons, in either view
+    student_headers = await _login(client, student)
+    for view in ("outline", "full"):
+        resp = await client.get(f"/api/v1/courses/{course.id}/lessons?view={view}", headers=student_headers)
+        assert [lesson["title"] for lesson in resp.json()] == ["Preview"]
+
+
+async def test_refused_student_gets_access_right_after_enrolling(
+    client: AsyncClient, instructor: User, student: User, course: Course
+):
+    (lesson,) = await _create_lessons(client, await _login(client, instructor), course.id, ["Locked"])
+    headers = await _login(client, student)
+    url = f"/api/v1/courses/{course.id}/lessons/{lesson['id']}"
+
+    assert (await client.get(url, headers=headers)).status_code == 403
+    assert await _titles_in_order(client, headers, course.id) == []
+
+    # The refusal was not cached, so enrolling takes effect immediately
+    assert (await client.post(f"/api/v1/courses/{course.id}/enroll", headers=headers)).status_code == 200
+    assert (await client.get(url, headers=headers)).status_code == 200
+    assert await _titles_in_order(client, headers, course.id) == ["Locked"]
+    # Served from the cached positive answer
+    assert (await client.get(url, headers=headers)).status_code == 200
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created = datetime(2026, 10, 16, 12, 30, 5, 123456)
+    token = encode_cursor("newest", created, 42)
+    assert decode_cursor(token, "newest", (datetime, int)) == (created, 42)
+
+
+def test_cursor_rejects_other_sort_order():
+    token = encode_cursor("rating", 4.5, 7)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "newest", (datetime, int))
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", "", encode_cursor("newest", "yesterday", 1)])
+def test_cursor_rejects_malformed_tokens(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "newest", (datetime, int))
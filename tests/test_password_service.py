@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.security import PasswordService, PasswordServiceBusy, get_password_hash, password_service
+from app.models.user import User, UserRole
+
+
+async def test_hash_and_verify_run_on_the_pool():
+    service = PasswordService(max_workers=1, max_concurrency=2, queue_timeout=1)
+    hashed = await service.hash("secret123")
+    assert await service.verify("secret123", hashed)
+    assert not await service.verify("wrong", hashed)
+    assert (await service._run(lambda: threading.current_thread().name)).startswith("password")
+
+
+async def test_rejects_work_beyond_concurrency_limit():
+    service = PasswordService(max_workers=1, max_concurrency=1, queue_timeout=0.05)
+    release = threading.Event()
+    busy = asyncio.ensure_future(service._run(release.wait))
+    await asyncio.sleep(0.01)
+    try:
+        with pytest.raises(PasswordServiceBusy):
+            await service._run(lambda: None)
+    finally:
+        release.set()
+        await busy
+    # The slot is free again once the first call finished
+    assert await service._run(lambda: "done") == "done"
+
+
+async def test_login_sheds_load_with_503(client: AsyncClient, test_db, monkeypatch):
+    email = "password_service_user@example.com"
+    if await test_db.scalar(select(User).where(User.email == email)) is None:
+        test_db.add(User(email=email, full_name="Busy User", hashed_password=get_password_hash("busypass"), role=UserRole.STUDENT))
+        await test_db.commit()
+
+    async def overloaded(*args):
+        raise PasswordServiceBusy()
+
+    monkeypatch.setattr(password_service, "verify", overloaded)
+    resp = await client.post("/api/v1/auth/login", data={"username": email, "password": "busypass"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
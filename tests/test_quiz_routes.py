@@ -1,12 +1,18 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.course import Course, CourseLevel
+from app.models.quiz import Option, Question
 
 
 @pytest.fixture
 async def instructor(test_db):
+    # The test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == "quiz_instructor@example.com"))
+    if user is not None:
+        return user
     user = User(
         email="quiz_instructor@example.com",
         full_name="Quiz Instructor",
@@ -20,6 +26,10 @@ async def instructor(test_db):
 
 @pytest.fixture
 async def student(test_db):
+    # The test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == "quiz_student@example.com"))
+    if user is not None:
+        return user
     user = User(
         email="quiz_student@example.com",
         full_name="Quiz Student",
@@ -110,4 +120,73 @@ async def test_start_attempt_without_enrollment(client: AsyncClient, student: Us
         headers={"Authorization": f"Bearer {token}"},
         json={}
     )
-    assert response.status_code == 403
\ No newline at end of file
+    assert response.status_code == 403
+
+async def _login(client: AsyncClient, email: str, password: str) -> dict:
+    resp = await client.post("/api/v1/auth/login", data={"username": email, "password": password})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def test_get_quiz_hides_answers_from_students(
+    client: AsyncClient, instructor: User, student: User, course: Course
+):
+    instructor_headers = await _login(client, instructor.email, "instrpass")
+    response = await client.post(
+        f"/api/v1/courses/{course.id}/quizzes",
+        headers=instructor_headers,
+        json={
+            "title": "Answer Quiz",
+            "questions": [{"text": "2+2?", "options": [{"text": "3"}, {"text": "4", "is_correct": True}]}],
+        },
+    )
+    quiz_id = response.json()["id"]
+
+    student_view = (await client.get(f"/api/v1/quizzes/{quiz_id}", headers=await _login(client, student.email, "studpass"))).json()
+    assert student_view["title"] == "Answer Quiz"
+    assert "updated_at" not in student_view
+    assert [set(option) for option in student_view["questions"][0]["options"]] == [{"id", "text"}] * 2
+
+    instructor_view = (await client.get(f"/api/v1/quizzes/{quiz_id}", headers=instructor_headers)).json()
+    assert sorted(option["is_correct"] for option in instructor_view["questions"][0]["options"]) == [False, True]
+
+    attempts = await client.get(f"/api/v1/quizzes/{quiz_id}/attempts", headers=instructor_headers)
+    assert attempts.status_code == 200
+    assert attempts.json() == []
+
+
+async def test_bulk_inserted_options_belong_to_their_questions(
+    client: AsyncClient, test_db, instructor: User, course: Course
+):
+    headers = await _login(client, instructor.email, "instrpass")
+    response = await client.post(
+        f"/api/v1/courses/{course.id}/quizzes",
+        headers=headers,
+        json={
+            "title": "Bulk Quiz",
+            "questions": [
+                {"text": "Q1", "order_index": 0, "options": [{"text": "a"}, {"text": "b", "is_correct": True}]},
+                {"text": "Q2", "order_index": 1, "options": [{"text": "c", "is_correct": True}]},
+                {"text": "Q3", "order_index": 2, "options": [{"text": "d"}, {"text": "e"}, {"text": "f", "is_correct": True}]},
+            ],
+        },
+    )
+    assert response.status_code == 200, response.text
+    questions = response.json()["questions"]
+    assert [q["text"] for q in questions] == ["Q1", "Q2", "Q3"]
+
+    added = await client.post(
+        f"/api/v1/quizzes/{response.json()['id']}/questions",
+        headers=headers,
+        json={"text": "Q4", "options": [{"text": "g", "is_correct": True}]},
+    )
+    assert added.status_code == 200, added.text
+
+    # The ids in the response are the rows that were written, in order
+    for question in questions:
+        assert await test_db.scalar(select(Question.text).where(Question.id == question["id"])) == question["text"]
+        rows = (await test_db.execute(
+            select(Option.id, Option.text, Option.is_correct).where(Option.question_id == question["id"])
+        )).all()
+        assert sorted(rows) == sorted(
+            (option["id"], option["text"], option["is_correct"]) for option in question["options"]
+        )
@@ -0,0 +1,54 @@
+from contextlib import asynccontextmanager
+
+from httpx import AsyncClient
+from starlette.requests import Request
+
+from app.api import deps
+from app.api.read_your_writes import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from app.main import app
+
+FRONTEND_ORIGIN = "http://localhost:5173"
+
+
+class _FakeSession:
+    def __init__(self, name):
+        self.name = name
+
+    async def close(self):
+        pass
+
+
+def _factory(name):
+    @asynccontextmanager
+    async def session():
+        yield _FakeSession(name)
+    return session
+
+
+async def _read_session_name(headers) -> str:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/courses", "query_string": b"", "headers": headers}
+    async for session in deps.get_read_db(Request(scope)):
+        return session.name
+
+
+async def test_marker_echoed_by_cross_site_client_reads_from_primary(monkeypatch):
+    # Routing only happens when a replica is configured
+    monkeypatch.setattr(deps, "read_engine", object())
+    monkeypatch.setattr(deps, "async_read_session", _factory("replica"))
+    monkeypatch.setattr(deps, "async_primary_read_session", _factory("primary"))
+    origin = (b"origin", FRONTEND_ORIGIN.encode())
+
+    async with AsyncClient(app=ReadYourWritesMiddleware(app, window=10), base_url="http://127.0.0.1:8000") as client:
+        resp = await client.post(
+            "/api/v1/auth/logout", json={"refresh_token": "unknown"}, headers={"Origin": FRONTEND_ORIGIN}
+        )
+    assert resp.status_code == 200
+    marker = resp.headers[LAST_WRITE_HEADER]
+    # The frontend can only read the marker if CORS exposes it
+    assert LAST_WRITE_HEADER.lower() in resp.headers["access-control-expose-headers"].lower()
+
+    # The next read from the frontend echoes the marker as a request header;
+    # no cookie is sent cross-site
+    echoed = [origin, (LAST_WRITE_HEADER.lower().encode(), marker.encode())]
+    assert await _read_session_name(echoed) == "primary"
+    assert await _read_session_name([origin]) == "replica"
@@ -0,0 +1,35 @@
+import asyncio
+
+from app.api.read_your_writes import LAST_WRITE_HEADER, ReadYourWritesMiddleware, wrote_recently
+
+
+def _run(method, status=200):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(ReadYourWritesMiddleware(app, window=10)({"type": "http", "method": method}, None, send))
+    return [value.decode() for key, value in sent[0]["headers"] if key == LAST_WRITE_HEADER.lower().encode()]
+
+
+def test_successful_write_sets_marker():
+    markers = _run("POST")
+    assert len(markers) == 1
+    assert wrote_recently(markers[0], 10)
+
+
+def test_reads_and_failed_writes_set_no_marker():
+    assert _run("GET") == []
+    assert _run("PUT", status=400) == []
+
+
+def test_wrote_recently():
+    assert wrote_recently("1000.5", 10, now=1005)
+    assert not wrote_recently("1000.5", 10, now=1020)
+    assert not wrote_recently(None, 10)
+    assert not wrote_recently("garbage", 10)
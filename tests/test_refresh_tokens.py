@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.core.security import get_password_hash, hash_refresh_token
+from app.models.user import User, UserRole
+from app.models.user_session import UserSession
+
+
+@pytest.fixture
+async def user(test_db):
+    user = User(
+        email=f"refresh_{uuid.uuid4().hex[:8]}@example.com",
+        full_name="Refresh User",
+        hashed_password=get_password_hash("refreshpass"),
+        role=UserRole.STUDENT
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+async def _login(client: AsyncClient, user: User) -> dict:
+    resp = await client.post("/api/v1/auth/login", data={"username": user.email, "password": "refreshpass"})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+async def test_login_stores_only_the_token_hash(client: AsyncClient, test_db, user: User):
+    tokens = await _login(client, user)
+    stored = (await test_db.execute(select(UserSession.token_hash).where(UserSession.user_id == user.id))).scalars().all()
+    assert stored == [hash_refresh_token(tokens["refresh_token"])]
+
+
+async def test_refresh_rotates_the_token(client: AsyncClient, user: User):
+    old = (await _login(client, user))["refresh_token"]
+
+    resp = await client.post("/api/v1/auth/refresh", json={"refresh_token": old})
+    assert resp.status_code == 200, resp.text
+    new = resp.json()["refresh_token"]
+    assert new != old
+    me = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {resp.json()['access_token']}"})
+    assert me.status_code == 200
+
+    # The presented token is spent; the rotated one keeps working
+    assert (await client.post("/api/v1/auth/refresh", json={"refresh_token": old})).status_code == 401
+    assert (await client.post("/api/v1/auth/refresh", json={"refresh_token": new})).status_code == 200
+
+
+async def test_logout_and_expiry_revoke_the_token(client: AsyncClient, test_db, user: User):
+    first = (await _login(client, user))["refresh_token"]
+    assert (await client.post("/api/v1/auth/logout", json={"refresh_token": first})).status_code == 200
+    assert (await client.post("/api/v1/auth/refresh", json={"refresh_token": first})).status_code == 401
+
+    second = (await _login(client, user))["refresh_token"]
+    await test_db.execute(
+        update(UserSession)
+        .where(UserSession.token_hash == hash_refresh_token(second))
+        .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await test_db.commit()
+    assert (await client.post("/api/v1/auth/refresh", json={"refresh_token": second})).status_code == 401
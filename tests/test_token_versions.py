@@ -0,0 +1,105 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+
+from app.api.deps import get_current_active_superuser, get_current_principal
+from app.api.role_checker import RoleChecker
+from app.core.security import create_access_token, get_password_hash
+from app.core.token_versions import TokenVersionTable, token_versions
+from app.models.token_revocation import TokenRevocation
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+async def admin(test_db):
+    # Shared by every test here; the test database is not reset between tests
+    user = await test_db.scalar(select(User).where(User.email == "token_admin@example.com"))
+    if user is not None:
+        return user
+    user = User(
+        email="token_admin@example.com",
+        full_name="Token Admin",
+        hashed_password=get_password_hash("adminpass"),
+        role=UserRole.ADMIN
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+@pytest.fixture
+async def student(test_db):
+    user = User(
+        email=f"token_student_{uuid.uuid4().hex[:8]}@example.com",
+        full_name="Token Student",
+        hashed_password=get_password_hash("studentpass"),
+        role=UserRole.STUDENT
+    )
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+async def _token(client: AsyncClient, email: str, password: str) -> dict:
+    resp = await client.post("/api/v1/auth/login", data={"username": email, "password": password})
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.mark.parametrize("change", [{"role": "instructor"}, {"password": "newpass123"}])
+async def test_old_token_rejected_after_version_bump(client: AsyncClient, admin: User, student: User, change):
+    student_headers = await _token(client, student.email, "studentpass")
+    assert (await client.get("/api/v1/auth/me", headers=student_headers)).status_code == 200
+
+    admin_headers = await _token(client, admin.email, "adminpass")
+    resp = await client.put(f"/api/v1/users/{student.id}", json=change, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+
+    assert (await client.get("/api/v1/auth/me", headers=student_headers)).status_code == 401
+
+
+async def test_deleted_user_token_rejected(client: AsyncClient, admin: User, student: User):
+    student_headers = await _token(client, student.email, "studentpass")
+    admin_headers = await _token(client, admin.email, "adminpass")
+
+    resp = await client.delete(f"/api/v1/users/{student.id}", headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+
+    assert (await client.get("/api/v1/auth/me", headers=student_headers)).status_code == 401
+
+
+async def test_other_worker_sees_revocation(test_db, student: User):
+    other_worker = TokenVersionTable(poll_interval=0)
+    assert await other_worker.lookup(student.id) == (student.token_version, UserRole.STUDENT)
+
+    # What update_user commits on a role change handled by another process
+    student.role = UserRole.INSTRUCTOR
+    student.token_version += 1
+    test_db.add(TokenRevocation(user_id=student.id))
+    await test_db.commit()
+
+    assert await other_worker.lookup(student.id) == (student.token_version, UserRole.INSTRUCTOR)
+
+
+async def test_role_checks_run_no_sql_on_table_hit(admin: User):
+    token = create_access_token(admin.id, role=admin.role.value, token_version=admin.token_version)
+    # Warm the table; the poll interval keeps the next lookups in memory
+    await token_versions.lookup(admin.id)
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        principal = await get_current_principal(token)
+        assert await RoleChecker([UserRole.ADMIN])(principal=principal) is True
+        assert get_current_active_superuser(principal=principal) is principal
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+    assert statements == []